@@ -0,0 +1,206 @@
+"""
+An asyncio API for the resolver. crunch_colors() takes tens of milliseconds for a
+6x6x6 or 7x7x7 so calling it from a coroutine stalls the event loop, AsyncResolver
+runs it in a thread or process pool instead:
+
+    resolver = AsyncResolver(max_in_flight=8)
+    kociemba = await resolver.resolve(scan_data)
+    results = await resolver.resolve_many(scans)
+    await resolver.close()
+
+At most max_in_flight scans are handed to the executor at once, the other callers
+wait on a semaphore, so any number of requests can be in flight without queueing
+them all in the executor. Cancelling a resolve() that is still waiting for the
+semaphore or for a free worker drops the scan, one that is already being resolved
+runs to completion and its result is discarded.
+
+This uses asyncio and concurrent.futures so it does not run on micropython.
+"""
+
+# standard libraries
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import import_module
+from typing import Dict, Iterable, List, Tuple, Union
+
+# rubiks cube libraries
+from rubikscolorresolver.metric import get_metric
+from rubikscolorresolver.packed import load_scan
+from rubikscolorresolver.solver import SUPPORTED_WIDTHS, RubiksColorSolverGeneric, _resolve_scan
+
+# The RubiksColorSolverGeneric objects, one per width, of each executor thread. A
+# process pool worker only has one thread so this works for both.
+worker_state = threading.local()
+
+
+def _get_worker_cubes() -> Dict[int, RubiksColorSolverGeneric]:
+    cubes = getattr(worker_state, "cubes", None)
+
+    if cubes is None:
+        cubes = {}
+        worker_state.cubes = cubes
+
+    return cubes
+
+
+def _async_worker_init(widths: Tuple[int]) -> None:
+    """
+    Runs once in each executor thread or process. Import the lookup tables and build
+    the geometry for each width up front so the first scan does not pay for it.
+    """
+    import_module("rubikscolorresolver.permutations")
+    cubes = _get_worker_cubes()
+
+    for width in widths:
+        import_module("rubikscolorresolver.cube_{}{}{}".format(width, width, width))
+        cubes[width] = RubiksColorSolverGeneric(width)
+
+
+def _async_worker(
+    scan: Union[str, bytes, Dict], width: int, use_json: bool, validate: bool, metric: str
+) -> Union[str, Dict]:
+    if isinstance(scan, (str, bytes)):
+        # load_scan() validates the scan
+        scan = load_scan(scan)
+        validate = False
+
+    return _resolve_scan(_get_worker_cubes(), scan, width, use_json, validate, metric=metric)
+
+
+class AsyncResolver(object):
+    """
+    Resolves scans in an executor without blocking the event loop.
+
+    - executor: the concurrent.futures.Executor to use. If None one is created with
+      workers threads, or processes if processes is True. workers defaults to the
+      number of CPUs. Threads share the GIL with the event loop so they only keep the
+      loop responsive, processes also resolve the scans in parallel.
+    - max_in_flight: the max number of scans handed to the executor at once, the
+      default is twice workers (pass workers along with an executor for this)
+    - use_json, validate, metric: as for resolve_many()
+
+    Each executor thread or process keeps its own RubiksColorSolverGeneric per width.
+    A scan may be a dictionary of position: (red, green, blue), a PackedCube or the
+    JSON of the scan. A PackedCube is pickled when processes is True so only the
+    returned result is available, as with resolve_many().
+    """
+
+    def __init__(
+        self,
+        executor: Executor = None,
+        workers: int = None,
+        processes: bool = False,
+        max_in_flight: int = None,
+        use_json: bool = False,
+        validate: bool = True,
+        metric: str = "euclidean",
+    ) -> None:
+        get_metric(metric)
+        self.use_json = use_json
+        self.validate = validate
+        self.metric = metric
+
+        if executor is None:
+            workers = workers or os.cpu_count() or 1
+            self.owns_executor = True
+
+            if processes:
+                executor_class = ProcessPoolExecutor
+            else:
+                executor_class = ThreadPoolExecutor
+
+            self.executor = executor_class(
+                max_workers=workers, initializer=_async_worker_init, initargs=(SUPPORTED_WIDTHS,)
+            )
+        else:
+            workers = workers or os.cpu_count() or 1
+            self.owns_executor = False
+            self.executor = executor
+
+        self.max_in_flight = max_in_flight or (2 * workers)
+
+        if self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1, it is {}".format(self.max_in_flight))
+
+        # The semaphore is created on first use so that it belongs to the running loop
+        self.semaphore = None
+
+        # The number of scans that have been handed to the executor and that it is not
+        # done with yet, this is never more than max_in_flight
+        self.in_flight = 0
+
+    def __str__(self) -> str:
+        return "AsyncResolver({}, {} max in flight)".format(self.executor.__class__.__name__, self.max_in_flight)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Shut down the executor if this AsyncResolver created it
+        """
+        if self.owns_executor and self.executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+            self.executor = None
+
+    async def resolve(self, scan: Union[str, bytes, Dict], width: int = None) -> Union[str, Dict]:
+        """
+        Return the kociemba string for scan, or the cube_for_json() dictionary if
+        use_json is True. The exceptions from resolving the scan are raised here.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self.semaphore is None:
+            self.semaphore = asyncio.BoundedSemaphore(self.max_in_flight)
+
+        semaphore = self.semaphore
+        await semaphore.acquire()
+
+        try:
+            future = self.executor.submit(_async_worker, scan, width, self.use_json, self.validate, self.metric)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        self.in_flight += 1
+
+        def release_slot() -> None:
+            self.in_flight -= 1
+            semaphore.release()
+
+        # The slot is released when the executor is done with the scan, not when the
+        # caller stops waiting, a cancelled scan that is already running still holds it
+        def release(future) -> None:
+            try:
+                loop.call_soon_threadsafe(release_slot)
+            except RuntimeError:
+                # the loop has been closed
+                pass
+
+        future.add_done_callback(release)
+
+        # Cancelling this also cancels future if the executor has not started it yet
+        return await asyncio.wrap_future(future)
+
+    async def resolve_many(self, scans: Iterable[Union[str, bytes, Dict]], width: int = None) -> List[Union[str, Dict]]:
+        """
+        Resolve the scans concurrently and return the results in the same order as
+        scans. If a scan fails, or this is cancelled, the scans that have not been
+        resolved yet are cancelled.
+        """
+        tasks = [asyncio.ensure_future(self.resolve(scan, width)) for scan in scans]
+
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
@@ -0,0 +1,225 @@
+"""
+Solvers for assignment problems, pairing each row of a cost matrix with a
+different column so that the total cost is as small as possible.
+"""
+
+try:
+    # standard libraries
+    from typing import List, Tuple
+except ImportError:
+    # this will barf for micropython...ignore it
+    pass
+
+
+def min_cost_permutation(costs: List[List[int]]) -> Tuple[int]:
+    """
+    costs is an N x N matrix where costs[row][col] is the cost of assigning col to row.
+    Return a tuple where entry row is the col assigned to that row, such that the
+    total cost is minimal.
+
+    This is a dynamic program over the 2^N subsets of cols that have been used, it is
+    intended for small N (6 for the colors of a cube). If several permutations have
+    the minimal cost the lexicographically smallest one is returned, this is the same
+    one a search of the permutations in lexicographic order would find first.
+    """
+    size = len(costs)
+    full_mask = (1 << size) - 1
+
+    # popcount[mask] is the number of cols used in mask, which is also the
+    # row that is assigned next
+    popcount = bytearray(full_mask + 1)
+
+    for mask in range(1, full_mask + 1):
+        popcount[mask] = popcount[mask >> 1] + (mask & 1)
+
+    # best[mask] is the minimal cost of assigning the rows that remain once the
+    # cols in mask have been used
+    best = [0] * (full_mask + 1)
+    cols = tuple([(col, 1 << col) for col in range(size)])
+
+    for mask in range(full_mask - 1, -1, -1):
+        row_costs = costs[popcount[mask]]
+        min_cost = None
+
+        for (col, bit) in cols:
+            if not mask & bit:
+                cost = row_costs[col] + best[mask | bit]
+
+                if min_cost is None or cost < min_cost:
+                    min_cost = cost
+
+        best[mask] = min_cost
+
+    # Walk from the first row picking the lowest col that is on a minimal path
+    result = []
+    mask = 0
+
+    for row in range(size):
+        row_costs = costs[row]
+
+        for (col, bit) in cols:
+            if not mask & bit and row_costs[col] + best[mask | bit] == best[mask]:
+                result.append(col)
+                mask |= bit
+                break
+
+    return tuple(result)
+
+
+def hungarian(costs: List[List[int]]) -> Tuple[int]:
+    """
+    costs is an N x M matrix (N <= M) where costs[row][col] is the cost of assigning
+    col to row. Return a tuple where entry row is the col assigned to that row, such
+    that the total cost is minimal.
+
+    This is the Hungarian algorithm (Kuhn-Munkres with potentials), it is O(N^2 * M)
+    so unlike min_cost_permutation() it can be used for the 12 or 24 edge pairs of an
+    orbit. When several assignments have the minimal cost which one is returned
+    depends only on costs.
+    """
+    rows = len(costs)
+
+    if not rows:
+        return ()
+
+    cols = len(costs[0])
+
+    if rows > cols:
+        raise ValueError("{} rows can not be assigned to {} cols".format(rows, cols))
+
+    inf = float("inf")
+
+    # The rows and cols are numbered from 1 here, col 0 is a sentinel.
+    # row_potential and col_potential are the dual variables, row_for_col[col] is
+    # the row currently assigned to col (0 for none) and prev_col is the path of
+    # cols used to reach each col while augmenting.
+    row_potential = [0] * (rows + 1)
+    col_potential = [0] * (cols + 1)
+    row_for_col = [0] * (cols + 1)
+    prev_col = [0] * (cols + 1)
+
+    for row in range(1, rows + 1):
+        row_for_col[0] = row
+        col0 = 0
+        min_slack = [inf] * (cols + 1)
+        used = bytearray(cols + 1)
+
+        # Grow a tree of tight edges from row until it reaches an unassigned col
+        while True:
+            used[col0] = 1
+            row0 = row_for_col[col0]
+            row0_costs = costs[row0 - 1]
+            row0_potential = row_potential[row0]
+            delta = inf
+            col1 = 0
+
+            for col in range(1, cols + 1):
+                if not used[col]:
+                    slack = row0_costs[col - 1] - row0_potential - col_potential[col]
+
+                    if slack < min_slack[col]:
+                        min_slack[col] = slack
+                        prev_col[col] = col0
+
+                    if min_slack[col] < delta:
+                        delta = min_slack[col]
+                        col1 = col
+
+            for col in range(cols + 1):
+                if used[col]:
+                    row_potential[row_for_col[col]] += delta
+                    col_potential[col] -= delta
+                else:
+                    min_slack[col] -= delta
+
+            col0 = col1
+
+            if not row_for_col[col0]:
+                break
+
+        # Flip the assignments along the path back to the sentinel
+        while col0:
+            col1 = prev_col[col0]
+            row_for_col[col0] = row_for_col[col1]
+            col0 = col1
+
+    result = [0] * rows
+
+    for col in range(1, cols + 1):
+        if row_for_col[col]:
+            result[row_for_col[col] - 1] = col - 1
+
+    return tuple(result)
+
+
+def best_swap_improvement(costs: List[List[int]]) -> List[int]:
+    """
+    costs is an N x N matrix where costs[row][col] is the cost of assigning col to row.
+    Start with col x assigned to row x, then keep swapping the cols of the two rows
+    whose swap lowers the total cost the most until no swap helps. If several swaps
+    are the best the first in (row x, row y) order is used. Return a list where entry
+    row is the col assigned to that row.
+
+    The best swap of each row x with a row y > x is cached. A swap of rows x and y
+    only changes the cost of swaps that involve x or y so the other cached entries
+    are either kept or updated from those two swaps, a full pass over all of the
+    pairs is not needed.
+    """
+    size = len(costs)
+    perm = list(range(size))
+
+    def swap_delta(x, y):
+        # how much lower the total cost would be if the cols of rows x and y were swapped
+        (col_x, col_y) = (perm[x], perm[y])
+        return costs[x][col_x] + costs[y][col_y] - costs[x][col_y] - costs[y][col_x]
+
+    # best_delta[x] and best_y[x] are the best swap of row x with a row y > x,
+    # best_y[x] is -1 if no swap lowers the cost
+    best_delta = [0] * size
+    best_y = [-1] * size
+
+    def update_row(x):
+        max_delta = 0
+        max_y = -1
+
+        for y in range(x + 1, size):
+            delta = swap_delta(x, y)
+
+            if delta > max_delta:
+                max_delta = delta
+                max_y = y
+
+        best_delta[x] = max_delta
+        best_y[x] = max_y
+
+    for x in range(size):
+        update_row(x)
+
+    while True:
+        max_delta = 0
+        x = -1
+
+        for row in range(size):
+            if best_delta[row] > max_delta:
+                max_delta = best_delta[row]
+                x = row
+
+        if x == -1:
+            break
+
+        y = best_y[x]
+        (perm[x], perm[y]) = (perm[y], perm[x])
+
+        for row in range(size):
+            if row == x or row == y or best_y[row] == x or best_y[row] == y:
+                update_row(row)
+            else:
+                for col in (x, y):
+                    if col > row:
+                        delta = swap_delta(row, col)
+
+                        if delta > best_delta[row] or (delta and delta == best_delta[row] and col < best_y[row]):
+                            best_delta[row] = delta
+                            best_y[row] = col
+
+    return perm
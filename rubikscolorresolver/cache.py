@@ -0,0 +1,148 @@
+try:
+    # standard libraries
+    from typing import Any, Dict, Hashable
+except ImportError:
+    # this will barf for micropython...ignore it
+    pass
+
+try:
+    # standard libraries
+    from threading import Lock
+except ImportError:
+    # micropython without thread support
+    Lock = None
+
+
+class NoLock(object):
+    """
+    Stands in for a Lock where there are no threads
+    """
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+class ClockCache(object):
+    """
+    A cache that holds at most max_size entries. When it is full the entry to evict
+    is picked with the CLOCK algorithm, an approximation of LRU that only needs a
+    referenced bit per entry. A hand sweeps over the slots, an entry that has been
+    used since the hand last passed it has its bit cleared and is skipped, the first
+    entry without the bit is evicted. A new entry starts without the bit so it is
+    only kept past the next sweep if it is used again.
+
+    This only uses a dict, lists and a bytearray so it runs on micropython.
+
+    get() and put() hold a lock. The module level caches are shared by every thread,
+    e.g. the ThreadPoolExecutor of AsyncResolver, and a put() that is interrupted
+    part way through could leave a key pointing at another key's value.
+    """
+
+    __slots__ = ("max_size", "slots", "keys", "values", "referenced", "hand", "hits", "misses", "evictions", "lock")
+
+    def __init__(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1, it is {}".format(max_size))
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if Lock is None:
+            self.lock = NoLock()
+        else:
+            self.lock = Lock()
+
+        self.clear()
+
+    def __str__(self) -> str:
+        return "ClockCache({}/{} entries)".format(len(self.slots), self.max_size)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def clear(self) -> None:
+        """
+        Remove all of the entries, the statistics are kept
+        """
+        with self.lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        # slots maps each key to its index in keys, values and referenced
+        self.slots = {}
+        self.keys = []
+        self.values = []
+        self.referenced = bytearray(self.max_size)
+        self.hand = 0
+
+    def resize(self, max_size: int) -> None:
+        """
+        Change the max number of entries, this empties the cache
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1, it is {}".format(max_size))
+
+        with self.lock:
+            self.max_size = max_size
+            self._clear()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Return the value for key, None if it is not in the cache
+        """
+        with self.lock:
+            slot = self.slots.get(key)
+
+            if slot is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.referenced[slot] = 1
+            return self.values[slot]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self.lock:
+            slot = self.slots.get(key)
+
+            if slot is not None:
+                self.values[slot] = value
+                self.referenced[slot] = 1
+                return
+
+            if len(self.keys) < self.max_size:
+                self.slots[key] = len(self.keys)
+                self.keys.append(key)
+                self.values.append(value)
+                return
+
+            referenced = self.referenced
+            hand = self.hand
+
+            while referenced[hand]:
+                referenced[hand] = 0
+                hand = (hand + 1) % self.max_size
+
+            del self.slots[self.keys[hand]]
+            self.evictions += 1
+            self.slots[key] = hand
+            self.keys[hand] = key
+            self.values[hand] = value
+            self.hand = (hand + 1) % self.max_size
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.slots),
+            "max_size": self.max_size,
+        }
@@ -3,11 +3,50 @@ from math import atan2, cos, degrees, exp, radians, sin, sqrt
 
 try:
     # standard libraries
-    from typing import Tuple
+    from typing import List, Tuple
 except ImportError:
     # this will barf for micropython...ignore it
     pass
 
+try:
+    # standard libraries
+    from math import isqrt
+except ImportError:
+    # micropython does not have isqrt, integer_sqrt() is used instead
+    isqrt = None
+
+try:
+    # third party libraries
+    import numpy
+except ImportError:
+    # numpy is optional, it is not available on micropython
+    numpy = None
+
+# rubiks cube libraries
+from rubikscolorresolver.cache import ClockCache
+
+
+def integer_sqrt(n: int) -> int:
+    """
+    The largest int whose square is <= n, using only integer math. This is only used
+    where math.isqrt() is not available (micropython).
+    """
+    if n <= 0:
+        return 0
+
+    x = n
+    y = (x + 1) >> 1
+
+    while y < x:
+        x = y
+        y = (x + (n // x)) >> 1
+
+    return x
+
+
+if isqrt is None:
+    isqrt = integer_sqrt
+
 
 html_color = {
     "Gr": {"red": 0, "green": 102, "blue": 0},
@@ -32,20 +71,54 @@ def hex_to_rgb(rgb_string: str) -> Tuple[int, int, int]:
     return (red, green, blue)
 
 
+def validate_rgb(position: int, rgb) -> None:
+    """
+    Raise a ValueError unless rgb is a list or tuple of three 8-bit integers. This is
+    shared by RubiksCube.validate_scan_data() and load_scan().
+    """
+    if not isinstance(rgb, (list, tuple)) or len(rgb) != 3:
+        raise ValueError("position {} RGB {} does not have 3 values".format(position, rgb))
+
+    for value in rgb:
+        # bool is a subclass of int
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0 or value > 255:
+            raise ValueError("position {} RGB {} is not 8-bit integers".format(position, rgb))
+
+
+# LabColor.fixed holds L, a and b as fixed point ints in units of 1/LAB_FIXED_SCALE
+LAB_FIXED_SHIFT = 4
+LAB_FIXED_SCALE = 1 << LAB_FIXED_SHIFT
+
+
 class LabColor(object):
+    __slots__ = ("L", "a", "b", "red", "green", "blue", "_fixed")
+
     def __init__(self, L: float, a: float, b: float, red: int, green: int, blue: int) -> None:
-        assert isinstance(L, float)
-        assert isinstance(a, float)
-        assert isinstance(b, float)
-        assert isinstance(red, int)
-        assert isinstance(green, int)
-        assert isinstance(blue, int)
         self.L = L
         self.a = a
         self.b = b
         self.red = red
         self.green = green
         self.blue = blue
+        self._fixed = None
+
+    @property
+    def fixed(self) -> Tuple[int, int, int]:
+        """
+        L, a and b as fixed point ints for the "fixed" metric. This is only computed
+        the first time it is used so the other metrics do not pay for it.
+        """
+        fixed = self._fixed
+
+        if fixed is None:
+            fixed = (
+                int(round(self.L * LAB_FIXED_SCALE)),
+                int(round(self.a * LAB_FIXED_SCALE)),
+                int(round(self.b * LAB_FIXED_SCALE)),
+            )
+            self._fixed = fixed
+
+        return fixed
 
     def __str__(self) -> str:
         return "Lab (%s, %s, %s)" % (self.L, self.a, self.b)
@@ -69,36 +142,57 @@ class LabColor(object):
         return self.b < other.b
 
 
-def rgb2lab(inputColor: Tuple[int, int, int]) -> LabColor:
+def _srgb_to_linear(value: int) -> float:
     """
-    Given a tuple of red, green, blue values return the corresponding LabColor object
+    sRGB gamma expansion of an 8-bit color channel, scaled to 0-100
     """
-    (red, green, blue) = inputColor
-
     # XYZ -> Standard-RGB
     # https://www.easyrgb.com/en/math.php
-    var_R = red / 255
-    var_G = green / 255
-    var_B = blue / 255
+    var = value / 255
 
-    if var_R > 0.04045:
-        var_R = pow(((var_R + 0.055) / 1.055), 2.4)
+    if var > 0.04045:
+        var = pow(((var + 0.055) / 1.055), 2.4)
     else:
-        var_R = var_R / 12.92
+        var = var / 12.92
 
-    if var_G > 0.04045:
-        var_G = pow(((var_G + 0.055) / 1.055), 2.4)
-    else:
-        var_G = var_G / 12.92
+    return var * 100
 
-    if var_B > 0.04045:
-        var_B = pow(((var_B + 0.055) / 1.055), 2.4)
-    else:
-        var_B = var_B / 12.92
 
-    var_R = var_R * 100
-    var_G = var_G * 100
-    var_B = var_B * 100
+# The inputs to rgb2lab are 8-bit so there are only 256 possible gamma expansions,
+# compute them once at import time.
+srgb_to_linear = tuple([_srgb_to_linear(value) for value in range(256)])
+
+if numpy is not None:
+    srgb_to_linear_array = numpy.array(srgb_to_linear, dtype=numpy.float64)
+
+# Cache of rgb2lab results keyed by (red << 16 | green << 8 | blue). The scans of a
+# solved side repeat the same RGB values a lot. The cache is emptied when it reaches
+# RGB2LAB_CACHE_SIZE entries so a long running process does not grow without bound.
+RGB2LAB_CACHE_SIZE = 4096
+rgb2lab_cache = {}
+
+
+def rgb2lab(inputColor: Tuple[int, int, int]) -> LabColor:
+    """
+    Given a tuple of red, green, blue values return the corresponding LabColor object.
+    The values must be ints, a ValueError is raised if one is not 0-255.
+    """
+    (red, green, blue) = inputColor
+
+    # A negative value would index srgb_to_linear from the end and 256 or more would
+    # collide with another color in the cache key, one bitwise check covers both
+    if (red | green | blue) & ~0xFF:
+        raise ValueError("RGB {} is not 8-bit integers".format(inputColor))
+
+    key = (red << 16) | (green << 8) | blue
+    lab = rgb2lab_cache.get(key)
+
+    if lab is not None:
+        return lab
+
+    var_R = srgb_to_linear[red]
+    var_G = srgb_to_linear[green]
+    var_B = srgb_to_linear[blue]
 
     X = var_R * 0.4124 + var_G * 0.3576 + var_B * 0.1805
     Y = var_R * 0.2126 + var_G * 0.7152 + var_B * 0.0722
@@ -134,7 +228,69 @@ def rgb2lab(inputColor: Tuple[int, int, int]) -> LabColor:
     b = 200 * (var_Y - var_Z)
     # logger.info("RGB ({}, {}, {}), L {}, a {}, b {}".format(red, green, blue, L, a, b))
 
-    return LabColor(L, a, b, red, green, blue)
+    lab = LabColor(L, a, b, red, green, blue)
+
+    if len(rgb2lab_cache) >= RGB2LAB_CACHE_SIZE:
+        rgb2lab_cache.clear()
+
+    rgb2lab_cache[key] = lab
+    return lab
+
+
+def rgb2lab_array(rgb):
+    """
+    Given an (N, 3) array of red, green, blue values return an (N, 3) numpy array of
+    the corresponding L, a, b values. This is the same math as rgb2lab() but it converts
+    every square of the cube in one vectorized pass. Requires numpy.
+
+    numpy's cube root may differ from the math library's in the last bit so the results
+    are not always identical to rgb2lab(), they agree to ~1e-13.
+
+    A ValueError is raised if a value is not 0-255.
+    """
+    rgb = numpy.asarray(rgb, dtype=numpy.intp)
+
+    if rgb.size and (rgb.min() < 0 or rgb.max() > 255):
+        raise ValueError("RGB values are not 8-bit integers")
+
+    var_RGB = srgb_to_linear_array[rgb]
+    var_R = var_RGB[:, 0]
+    var_G = var_RGB[:, 1]
+    var_B = var_RGB[:, 2]
+
+    X = var_R * 0.4124 + var_G * 0.3576 + var_B * 0.1805
+    Y = var_R * 0.2126 + var_G * 0.7152 + var_B * 0.0722
+    Z = var_R * 0.0193 + var_G * 0.1192 + var_B * 0.9505
+
+    reference_X = 95.047
+    reference_Y = 100.0
+    reference_Z = 108.883
+
+    # XYZ -> CIE-L*ab
+    # //www.easyrgb.com/en/math.php
+    var_XYZ = numpy.stack((X / reference_X, Y / reference_Y, Z / reference_Z), axis=1)
+    var_XYZ = numpy.where(var_XYZ > 0.008856, numpy.power(var_XYZ, 1 / 3), (7.787 * var_XYZ) + (16 / 116))
+    var_X = var_XYZ[:, 0]
+    var_Y = var_XYZ[:, 1]
+    var_Z = var_XYZ[:, 2]
+
+    L = (116 * var_Y) - 16
+    a = 500 * (var_X - var_Y)
+    b = 200 * (var_Y - var_Z)
+
+    return numpy.stack((L, a, b), axis=1)
+
+
+def rgb_list_to_lab(rgb_list: List[Tuple[int, int, int]]) -> List[LabColor]:
+    """
+    Given a list of (red, green, blue) tuples return a list of the corresponding
+    LabColor objects. Uses the vectorized rgb2lab_array() when numpy is available.
+    """
+    if numpy is None or not rgb_list:
+        return [rgb2lab(rgb) for rgb in rgb_list]
+
+    lab_list = rgb2lab_array(rgb_list).tolist()
+    return [LabColor(L, a, b, red, green, blue) for ((L, a, b), (red, green, blue)) in zip(lab_list, rgb_list)]
 
 
 def rgb_to_hsv(r: int, g: int, b: int) -> Tuple[float, float, float]:
@@ -163,7 +319,12 @@ def rgb_to_hsv(r: int, g: int, b: int) -> Tuple[float, float, float]:
     return (h, s, v)
 
 
-cie2000_cache = {}
+# Cache of lab_distance_cie2000() results. The distance is symmetric so each pair of
+# colors is stored once, under the key with the smaller (L, a, b) first. The cache
+# is bounded so a long running process does not grow without bound, use
+# cie2000_cache.resize() to change CIE2000_CACHE_SIZE.
+CIE2000_CACHE_SIZE = 8192
+cie2000_cache = ClockCache(CIE2000_CACHE_SIZE)
 
 
 def lab_distance_cie2000(lab1, lab2):
@@ -173,7 +334,6 @@ def lab_distance_cie2000(lab1, lab2):
     Ported from this php implementation
     https://github.com/renasboy/php-color-difference/blob/master/lib/color_difference.class.php
     """
-    global cie2000_cache
     l1 = lab1.L
     a1 = lab1.a
     b1 = lab1.b
@@ -182,12 +342,12 @@ def lab_distance_cie2000(lab1, lab2):
     a2 = lab2.a
     b2 = lab2.b
 
-    delta_e = cie2000_cache.get((l1, a1, b1, l2, a2, b2))
-
-    if delta_e is not None:
-        return delta_e
+    if (l1, a1, b1) <= (l2, a2, b2):
+        key = (l1, a1, b1, l2, a2, b2)
+    else:
+        key = (l2, a2, b2, l1, a1, b1)
 
-    delta_e = cie2000_cache.get((l2, a2, b2, l1, a1, b1))
+    delta_e = cie2000_cache.get(key)
 
     if delta_e is not None:
         return delta_e
@@ -252,13 +412,44 @@ def lab_distance_cie2000(lab1, lab2):
         + ((delta_hp / (s_h * kh)) ** 2)
         + r_t * (delta_cp / (s_c * kc)) * (delta_hp / (s_h * kh))
     )
-
-    cie2000_cache[(l1, a1, b1, l2, a2, b2)] = delta_e
-    cie2000_cache[(l2, a2, b2, l1, a1, b1)] = delta_e
+    cie2000_cache.put(key, delta_e)
 
     return delta_e
 
 
+def lab_distance_cie2000_int(lab1: LabColor, lab2: LabColor) -> int:
+    """
+    lab_distance_cie2000() truncated to an int like lab_distance()
+    """
+    return int(lab_distance_cie2000(lab1, lab2))
+
+
+def lab_distance_cie94(lab1: LabColor, lab2: LabColor) -> int:
+    """
+    delta CIE 94 truncated to an int like lab_distance(), with the graphic arts
+    weights (kL 1, K1 0.045, K2 0.015)
+
+    CIE94 weighs the chroma and hue terms by the chroma of the reference color, which
+    makes it asymmetric. The geometric mean of the two chromas is used instead so
+    that the distance from lab1 to lab2 is the same as from lab2 to lab1.
+    """
+    delta_l = lab1.L - lab2.L
+    delta_a = lab1.a - lab2.a
+    delta_b = lab1.b - lab2.b
+    c1 = sqrt((lab1.a**2) + (lab1.b**2))
+    c2 = sqrt((lab2.a**2) + (lab2.b**2))
+    delta_c = c1 - c2
+    delta_h_squared = (delta_a**2) + (delta_b**2) - (delta_c**2)
+
+    if delta_h_squared < 0:
+        delta_h_squared = 0
+
+    c = sqrt(c1 * c2)
+    s_c = 1 + 0.045 * c
+    s_h = 1 + 0.015 * c
+    return int(sqrt((delta_l**2) + ((delta_c / s_c) ** 2) + (delta_h_squared / (s_h**2))))
+
+
 def lab_distance(lab1: LabColor, lab2: LabColor) -> int:
     """
     http://www.w3resource.com/python-exercises/math/python-math-exercise-79.php
@@ -268,11 +459,127 @@ def lab_distance(lab1: LabColor, lab2: LabColor) -> int:
     distance, Euclidean space becomes a metric space. The associated norm is called
     the Euclidean norm.
     """
-    # CIE2000 takes about 3x more CPU so use euclidean distance to save some cycles.  CIE2000
-    # does give a more accurate distance metric but for our purposes it is no longer worth
-    # the extra CPU cycles.
+    # CIE2000 takes about 3x more CPU so euclidean distance is the default, see
+    # rubikscolorresolver/metric.py for the other metrics.
     return int(sqrt(((lab1.L - lab2.L) ** 2) + ((lab1.a - lab2.a) ** 2) + ((lab1.b - lab2.b) ** 2)))
-    # return lab_distance_cie2000(lab1, lab2)
+
+
+def lab_distance_fixed(lab1: LabColor, lab2: LabColor) -> int:
+    """
+    lab_distance() computed from the fixed point Lab values with integer math only,
+    for boards without an FPU. The Lab values are rounded to 1/LAB_FIXED_SCALE so
+    this can be off by one from lab_distance().
+    """
+    (L1, a1, b1) = lab1.fixed
+    (L2, a2, b2) = lab2.fixed
+    return isqrt(((L1 - L2) * (L1 - L2)) + ((a1 - a2) * (a1 - a2)) + ((b1 - b2) * (b1 - b2))) >> LAB_FIXED_SHIFT
+
+
+def lab_list_to_array(lab_list: List[LabColor]):
+    """
+    Pack a list of LabColor objects into an (N, 3) numpy array of L, a, b values
+    """
+    return numpy.array([(lab.L, lab.a, lab.b) for lab in lab_list], dtype=numpy.float64)
+
+
+def lab_distance_matrix(lab_list1: List[LabColor], lab_list2: List[LabColor]):
+    """
+    Vectorized lab_distance(). Returns an (N, M) numpy array where [x][y] is the
+    lab_distance() between lab_list1[x] and lab_list2[y]. Requires numpy.
+    """
+    delta = lab_list_to_array(lab_list1)[:, None, :] - lab_list_to_array(lab_list2)[None, :, :]
+    return numpy.sqrt((delta[:, :, 0] ** 2) + (delta[:, :, 1] ** 2) + (delta[:, :, 2] ** 2)).astype(numpy.int64)
+
+
+def lab_distance_fixed_matrix(lab_list1: List[LabColor], lab_list2: List[LabColor]):
+    """
+    Vectorized lab_distance_fixed(). Requires numpy.
+
+    The squared distances are exact ints well below 2^52, so the float sqrt of them
+    truncates to the same value as isqrt().
+    """
+    fixed1 = numpy.array([lab.fixed for lab in lab_list1], dtype=numpy.int64)[:, None, :]
+    fixed2 = numpy.array([lab.fixed for lab in lab_list2], dtype=numpy.int64)[None, :, :]
+    delta = fixed1 - fixed2
+    squared = (delta[:, :, 0] ** 2) + (delta[:, :, 1] ** 2) + (delta[:, :, 2] ** 2)
+    return numpy.sqrt(squared).astype(numpy.int64) >> LAB_FIXED_SHIFT
+
+
+def lab_distance_cie94_matrix(lab_list1: List[LabColor], lab_list2: List[LabColor]):
+    """
+    Vectorized lab_distance_cie94(). Requires numpy.
+    """
+    lab1 = lab_list_to_array(lab_list1)[:, None, :]
+    lab2 = lab_list_to_array(lab_list2)[None, :, :]
+    delta = lab1 - lab2
+    c1 = numpy.sqrt((lab1[:, :, 1] ** 2) + (lab1[:, :, 2] ** 2))
+    c2 = numpy.sqrt((lab2[:, :, 1] ** 2) + (lab2[:, :, 2] ** 2))
+    delta_c = c1 - c2
+    delta_h_squared = numpy.maximum((delta[:, :, 1] ** 2) + (delta[:, :, 2] ** 2) - (delta_c**2), 0)
+    c = numpy.sqrt(c1 * c2)
+    s_c = 1 + 0.045 * c
+    s_h = 1 + 0.015 * c
+    return numpy.sqrt((delta[:, :, 0] ** 2) + ((delta_c / s_c) ** 2) + (delta_h_squared / (s_h**2))).astype(
+        numpy.int64
+    )
+
+
+def lab_distance_cie2000_matrix(lab_list1: List[LabColor], lab_list2: List[LabColor]):
+    """
+    Vectorized lab_distance_cie2000_int(). Requires numpy.
+
+    numpy and the math module may round the trig functions differently in the last
+    bit, so a distance that is within a rounding error of an integer can be off by
+    one compared to lab_distance_cie2000_int().
+    """
+    lab1 = lab_list_to_array(lab_list1)[:, None, :]
+    lab2 = lab_list_to_array(lab_list2)[None, :, :]
+    (l1, a1, b1) = (lab1[:, :, 0], lab1[:, :, 1], lab1[:, :, 2])
+    (l2, a2, b2) = (lab2[:, :, 0], lab2[:, :, 1], lab2[:, :, 2])
+
+    avg_lp = (l1 + l2) / 2.0
+    c1 = numpy.sqrt(a1**2 + b1**2)
+    c2 = numpy.sqrt(a2**2 + b2**2)
+    avg_c = (c1 + c2) / 2.0
+    g = (1 - numpy.sqrt(avg_c**7 / (avg_c**7 + 25**7))) / 2.0
+    a1p = a1 * (1 + g)
+    a2p = a2 * (1 + g)
+    c1p = numpy.sqrt(a1p**2 + b1**2)
+    c2p = numpy.sqrt(a2p**2 + b2**2)
+    avg_cp = (c1p + c2p) / 2.0
+    h1p = numpy.degrees(numpy.arctan2(b1, a1p))
+    h1p = numpy.where(h1p < 0, h1p + 360, h1p)
+    h2p = numpy.degrees(numpy.arctan2(b2, a2p))
+    h2p = numpy.where(h2p < 0, h2p + 360, h2p)
+    avg_hp = numpy.where(numpy.abs(h1p - h2p) > 180, (h1p + h2p + 360) / 2.0, (h1p + h2p) / 2.0)
+
+    t = (
+        1
+        - 0.17 * numpy.cos(numpy.radians(avg_hp - 30))
+        + 0.24 * numpy.cos(numpy.radians(2 * avg_hp))
+        + 0.32 * numpy.cos(numpy.radians(3 * avg_hp + 6))
+        - 0.2 * numpy.cos(numpy.radians(4 * avg_hp - 63))
+    )
+    delta_hp = h2p - h1p
+    delta_hp = numpy.where(numpy.abs(delta_hp) > 180, numpy.where(h2p <= h1p, delta_hp + 360, delta_hp - 360), delta_hp)
+
+    delta_lp = l2 - l1
+    delta_cp = c2p - c1p
+    delta_hp = 2 * numpy.sqrt(c1p * c2p) * numpy.sin(numpy.radians(delta_hp) / 2.0)
+    s_l = 1 + ((0.015 * ((avg_lp - 50) ** 2)) / numpy.sqrt(20 + ((avg_lp - 50) ** 2)))
+    s_c = 1 + 0.045 * avg_cp
+    s_h = 1 + 0.015 * avg_cp * t
+
+    delta_ro = 30 * numpy.exp(-((((avg_hp - 275) / 25.0) ** 2)))
+
+    r_c = 2 * numpy.sqrt((avg_cp**7) / ((avg_cp**7) + (25**7)))
+    r_t = -r_c * numpy.sin(2 * numpy.radians(delta_ro))
+    return numpy.sqrt(
+        ((delta_lp / s_l) ** 2)
+        + ((delta_cp / s_c) ** 2)
+        + ((delta_hp / s_h) ** 2)
+        + r_t * (delta_cp / s_c) * (delta_hp / s_h)
+    ).astype(numpy.int64)
 
 
 def hashtag_rgb_to_labcolor(rgb_string: str) -> LabColor:
@@ -3,15 +3,43 @@ import sys
 from math import ceil
 
 # rubiks cube libraries
+from rubikscolorresolver.color import validate_rgb
 from rubikscolorresolver.side import Side
+from rubikscolorresolver.www import HTML_FILENAME
 
 
 class RubiksCube:
-    def __init__(self, width: int) -> None:
+    def __init__(self, width: int, validate: bool = True) -> None:
         self.width = width
+        self.validate = validate
         self.squares_per_side = self.width * self.width
         self.orbits = int(ceil((self.width - 2) / 2.0))
+
+        # Write a debug page to debug_filename after each crunch_colors(). The page is
+        # built in html_buffer and written at the end, this is never done in batch mode.
         self.write_debug_file = False
+        self.debug_filename = HTML_FILENAME
+        self.html_buffer = []
+
+        # The number of 2-opt/Or-opt passes (and the max seconds for them) run over
+        # each greedy traveling salesman solution, 0 keeps the greedy solution
+        self.tsp_optim_steps = 0
+        self.tsp_time_budget = None
+
+        # How the scanned corners and edge pairs are matched to the colors from the
+        # color box. "tsp" solves a traveling salesman over the targets and the
+        # scanned pieces, "hungarian" finds the minimum cost assignment.
+        self.match_method = "tsp"
+
+        # The color distance metric, one of rubikscolorresolver.metric.METRICS
+        self.metric = "euclidean"
+
+        # Set to a rubikscolorresolver.profile.StageTimings to time each stage of
+        # crunch_colors(), None (the default) skips the timing entirely
+        self.stage_timings = None
+
+        # The DistanceCache used while crunch_colors() runs, see solver.py
+        self.distance_cache = None
 
         self.sides = {
             "U": Side(self.width, "U"),
@@ -90,6 +118,41 @@ class RubiksCube:
 
         self.calculate_pos2side()
 
+    def reset(self) -> None:
+        """
+        Forget the squares from the previous scan. The geometry (sides, wing
+        partners, pos2side) only depends on the width so it is kept as-is.
+        """
+        for side in self.sides.values():
+            side.reset()
+
+        self.pos2square = {}
+
+    def validate_scan_data(self, scan_data) -> None:
+        """
+        Raise a ValueError unless scan_data has a (red, green, blue) tuple of 8-bit
+        integers for every position of the cube
+        """
+        square_count = self.squares_per_side * 6
+
+        if len(scan_data) != square_count:
+            raise ValueError(
+                "{}x{}x{} cube has {} squares, scan data has {}".format(
+                    self.width, self.width, self.width, square_count, len(scan_data)
+                )
+            )
+
+        positions = set()
+
+        for (position, rgb) in scan_data.items():
+            position = int(position)
+
+            if position < 1 or position > square_count or position in positions:
+                raise ValueError("invalid or duplicate position {}".format(position))
+
+            positions.add(position)
+            validate_rgb(position, rgb)
+
     def calculate_pos2side(self) -> None:
         for side in self.sides.values():
             for x in range(side.min_pos, side.max_pos + 1):
@@ -0,0 +1,282 @@
+# standard libraries
+from array import array
+
+try:
+    # standard libraries
+    from typing import Dict, List
+except ImportError:
+    # this will barf for micropython...ignore it
+    pass
+
+# rubiks cube libraries
+from rubikscolorresolver.color import LabColor, numpy
+from rubikscolorresolver.metric import EUCLIDEAN, Metric
+from rubikscolorresolver.packed import COLOR_NAMES
+from rubikscolorresolver.square import Square
+
+INT32_MAX = (1 << 31) - 1
+
+
+class DistanceCache(object):
+    """
+    The Lab distances between the squares of one cube scan and the reference colors
+    (crayola_colors, the color_box) that the resolve stages compare them against.
+
+    Each entry has an index, position - 1 for the squares of the cube followed by
+    six extra columns for each set of reference colors added via add_colors(). The
+    distances are kept in the lower triangle of a square matrix in an array('i'),
+    -1 marks an entry that has not been computed yet. These are 32-bit so that any
+    metric fits, a distance that does not raises an OverflowError rather than wrapping.
+
+    Without numpy the entries are computed the first time they are asked for and
+    matrix() returns a list of lists. With numpy all of the entries for the squares,
+    and later for each set of reference colors, are computed at once and matrix()
+    returns numpy arrays.
+
+    The distances are computed with metric, Euclidean by default.
+
+    hits and misses count the distances that were served from the cache vs computed.
+    """
+
+    __slots__ = (
+        "square_count",
+        "metric",
+        "size",
+        "labs",
+        "table",
+        "row_start",
+        "full",
+        "color_sets",
+        "color_box_offset",
+        "color_box_index",
+        "hits",
+        "misses",
+    )
+
+    def __init__(
+        self, square_count: int, color_set_count: int = 2, use_numpy: bool = True, metric: Metric = EUCLIDEAN
+    ) -> None:
+        self.square_count = square_count
+        self.metric = metric
+        self.size = square_count + (len(COLOR_NAMES) * color_set_count)
+        self.labs = [None] * self.size
+        self.table = array("i", [-1]) * ((self.size * (self.size + 1)) // 2)
+
+        # row_start[x] is where row x of the lower triangle starts in self.table
+        self.row_start = tuple([(x * (x + 1)) // 2 for x in range(self.size)])
+        self.color_sets = []
+        self.color_box_offset = None
+        self.color_box_index = {}
+        self.hits = 0
+        self.misses = 0
+
+        if use_numpy and numpy is not None:
+            self.full = numpy.full((self.size, self.size), -1, dtype=numpy.int32)
+        else:
+            self.full = None
+
+    def __str__(self) -> str:
+        return "DistanceCache({} entries, {}, {} hits, {} misses)".format(
+            self.size, self.metric.name, self.hits, self.misses
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def set_squares(self, squares: List[Square]) -> None:
+        """
+        Add the Lab values of the squares of the cube
+        """
+        for square in squares:
+            self.labs[square.position - 1] = square.lab
+
+        self.fill(0, self.square_count)
+
+    def add_colors(self, colors: Dict[str, LabColor], color_box: bool = False) -> None:
+        """
+        Add a set of six reference colors. Squares that do not have a position (the
+        ones built from the color box) are looked up in the set added with color_box=True.
+        """
+        offset = self.square_count + (len(self.color_sets) * len(COLOR_NAMES))
+
+        if offset + len(COLOR_NAMES) > self.size:
+            raise ValueError("{} only has room for {} color sets".format(self, len(self.color_sets)))
+
+        self.color_sets.append((colors, offset))
+
+        for (index, color_name) in enumerate(COLOR_NAMES):
+            self.labs[offset + index] = colors[color_name]
+
+        if color_box:
+            self.color_box_offset = offset
+            self.color_box_index = {color_name: offset + index for (index, color_name) in enumerate(COLOR_NAMES)}
+
+        self.fill(offset, offset + len(COLOR_NAMES))
+
+    def fill(self, start: int, end: int) -> None:
+        """
+        With numpy compute all of the distances between the entries start..end-1 and
+        the entries before them at once, without numpy they are computed lazily. The
+        entries must be added in index order.
+        """
+        if self.full is None:
+            return
+
+        distances = self.metric.numpy_distance_matrix(self.labs[start:end], self.labs[:end])
+
+        if distances.size and (distances.min() < 0 or distances.max() > INT32_MAX):
+            raise OverflowError("{} distances do not fit in 32 bits".format(self.metric))
+
+        distances = distances.astype(numpy.int32)
+        self.full[start:end, :end] = distances
+        self.full[:end, start:end] = distances.T
+
+        # Rows start..end-1 of the lower triangle are contiguous in self.table, row x
+        # holds the distances to entries 0..x
+        rows = numpy.arange(start, end)[:, None]
+        cols = numpy.arange(end)[None, :]
+        self.table[self.row_start[start] : self.row_start[end - 1] + end] = array(
+            "i", distances[cols <= rows].tobytes()
+        )
+        self.misses += int(distances.size)
+
+    def release(self) -> None:
+        """
+        Free the distances, the hits and misses are kept
+        """
+        self.labs = None
+        self.table = None
+        self.row_start = None
+        self.full = None
+        self.color_sets = []
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def index(self, square: Square) -> int:
+        if square.position is None:
+            return self.color_box_index[square.color_name]
+        else:
+            return square.position - 1
+
+    def color_index(self, colors: Dict[str, LabColor], color_name: str) -> int:
+        """
+        Return the index of color_name in the set of reference colors added as colors
+        """
+        for (color_set, offset) in self.color_sets:
+            if color_set is colors:
+                return offset + COLOR_NAMES.index(color_name)
+
+        raise ValueError("{} colors have not been added".format(self))
+
+    def get(self, x: int, y: int) -> int:
+        """
+        Return the distance between entries x and y
+        """
+        if x < y:
+            table_index = self.row_start[y] + x
+        else:
+            table_index = self.row_start[x] + y
+
+        distance = self.table[table_index]
+
+        if distance < 0:
+            distance = self.metric.distance(self.labs[x], self.labs[y])
+            self.table[table_index] = distance
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return distance
+
+    def distance(self, square1: Square, square2: Square) -> int:
+        """
+        A cached metric.distance(square1.lab, square2.lab). This is called a lot, the
+        work of index() and get() is done inline.
+        """
+        x = square1.position
+        y = square2.position
+
+        if x is None:
+            x = self.color_box_index[square1.color_name]
+        else:
+            x -= 1
+
+        if y is None:
+            y = self.color_box_index[square2.color_name]
+        else:
+            y -= 1
+
+        if x < y:
+            table_index = self.row_start[y] + x
+        else:
+            table_index = self.row_start[x] + y
+
+        distance = self.table[table_index]
+
+        if distance < 0:
+            distance = self.metric.distance(self.labs[x], self.labs[y])
+            self.table[table_index] = distance
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return distance
+
+    def color_distance(self, square: Square, colors: Dict[str, LabColor], color_name: str) -> int:
+        """
+        A cached metric.distance(square.lab, colors[color_name])
+        """
+        return self.get(self.index(square), self.color_index(colors, color_name))
+
+    def color_distance_sum(self, squares: List[Square], colors: Dict[str, LabColor], color_name: str) -> int:
+        """
+        The sum of color_distance() for each of the squares
+        """
+        y = self.color_index(colors, color_name)
+        return sum([self.get(self.index(square), y) for square in squares])
+
+    def matrix(self, squares1: List[Square], squares2: List[Square]):
+        """
+        A cached lab_distance_matrix() of the squares. With numpy this is a numpy
+        array, without numpy it is a list of lists.
+        """
+        rows = [self.index(square) for square in squares1]
+        cols = [self.index(square) for square in squares2]
+
+        if self.full is not None:
+            self.hits += len(rows) * len(cols)
+            return self.full[numpy.ix_(rows, cols)].astype(numpy.int64)
+
+        lab_distance = self.metric.distance
+        labs = self.labs
+        table = self.table
+        row_start = self.row_start
+        result = []
+        misses = 0
+
+        for x in rows:
+            x_start = row_start[x]
+            x_lab = labs[x]
+            row = []
+
+            for y in cols:
+                if y <= x:
+                    table_index = x_start + y
+                else:
+                    table_index = row_start[y] + x
+
+                distance = table[table_index]
+
+                if distance < 0:
+                    distance = lab_distance(x_lab, labs[y])
+                    table[table_index] = distance
+                    misses += 1
+
+                row.append(distance)
+
+            result.append(row)
+
+        self.hits += (len(rows) * len(cols)) - misses
+        self.misses += misses
+        return result
@@ -0,0 +1,63 @@
+"""
+The color distance metrics the resolver can use. Each metric has
+
+- distance(lab1, lab2), the distance truncated to an int. The resolver sums and
+  compares these so every metric returns ints like lab_distance() always has.
+- numpy_distance_matrix(lab_list1, lab_list2), the vectorized distance() as an
+  (N, M) numpy array. DistanceCache uses this when numpy is available.
+"""
+
+try:
+    # standard libraries
+    from typing import Callable
+except ImportError:
+    # this will barf for micropython...ignore it
+    pass
+
+# rubiks cube libraries
+from rubikscolorresolver.color import (
+    lab_distance,
+    lab_distance_cie94,
+    lab_distance_cie94_matrix,
+    lab_distance_cie2000_int,
+    lab_distance_cie2000_matrix,
+    lab_distance_fixed,
+    lab_distance_fixed_matrix,
+    lab_distance_matrix,
+)
+
+
+class Metric(object):
+    __slots__ = ("name", "distance", "numpy_distance_matrix")
+
+    def __init__(self, name: str, distance: Callable, numpy_distance_matrix: Callable) -> None:
+        self.name = name
+        self.distance = distance
+        self.numpy_distance_matrix = numpy_distance_matrix
+
+    def __str__(self) -> str:
+        return "Metric({})".format(self.name)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+# CIE76 delta E is the Euclidean distance in Lab so those two share an implementation
+EUCLIDEAN = Metric("euclidean", lab_distance, lab_distance_matrix)
+
+METRICS = {
+    "euclidean": EUCLIDEAN,
+    "cie76": Metric("cie76", lab_distance, lab_distance_matrix),
+    "cie94": Metric("cie94", lab_distance_cie94, lab_distance_cie94_matrix),
+    "fixed": Metric("fixed", lab_distance_fixed, lab_distance_fixed_matrix),
+    "cie2000": Metric("cie2000", lab_distance_cie2000_int, lab_distance_cie2000_matrix),
+}
+
+
+def get_metric(name: str) -> Metric:
+    metric = METRICS.get(name)
+
+    if metric is None:
+        raise ValueError("invalid metric {}, choose from {}".format(name, ", ".join(sorted(METRICS.keys()))))
+
+    return metric
@@ -0,0 +1,214 @@
+# standard libraries
+from array import array
+from math import sqrt
+
+try:
+    # standard libraries
+    from typing import Dict, List, Tuple, Union
+except ImportError:
+    # this will barf for micropython...ignore it
+    pass
+
+try:
+    # standard libraries
+    from json import loads as json_loads
+except ImportError:
+    from ujson import loads as json_loads
+
+# rubiks cube libraries
+from rubikscolorresolver.color import validate_rgb
+from rubikscolorresolver.side import Side
+from rubikscolorresolver.square import Square
+
+# The color index stored for each square is 0 if the square has not been
+# resolved yet, else 1 + the index of its color name in COLOR_NAMES
+COLOR_NAMES = ("Bu", "Gr", "OR", "Rd", "Wh", "Ye")
+SIDE_NAMES = ("U", "L", "F", "R", "B", "D")
+SUPPORTED_WIDTHS = (2, 3, 4, 5, 6, 7)
+
+
+class PackedCube(object):
+    """
+    A compact storage format for a whole cube scan. Instead of a Square and LabColor
+    object per square the values are kept in flat arrays indexed by position - 1:
+
+    - rgb: array('B') of red, green, blue for each square
+    - color: bytearray of the color index (see COLOR_NAMES) for each square
+
+    This is a few KB per cube so a batch job can hold a large number of them. It is
+    only storage, RubiksColorSolverGeneric.resolve_packed() loads rgb into the
+    Square/Side objects it resolves with (the Lab values are computed then) and
+    writes the resulting colors back to color.
+    """
+
+    __slots__ = ("width", "square_count", "rgb", "color", "color_to_side_name")
+
+    def __init__(self, width: int) -> None:
+        self.width = width
+        self.square_count = width * width * 6
+        self.rgb = array("B", bytes(self.square_count * 3))
+        self.color = bytearray(self.square_count)
+        self.color_to_side_name = None
+
+    def __str__(self) -> str:
+        return "PackedCube({}x{}x{})".format(self.width, self.width, self.width)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @classmethod
+    def from_scan_data(cls, scan_data: Dict[int, Tuple[int, int, int]]) -> "PackedCube":
+        """
+        Build a PackedCube from a dictionary of position: (red, green, blue). The
+        positions may be integers or strings.
+        """
+        width = int(sqrt(len(scan_data) / 6))
+        packed = cls(width)
+        rgb = packed.rgb
+
+        for (position, (red, green, blue)) in scan_data.items():
+            index = (int(position) - 1) * 3
+            rgb[index] = red
+            rgb[index + 1] = green
+            rgb[index + 2] = blue
+
+        return packed
+
+    def get_rgb(self, position: int) -> Tuple[int, int, int]:
+        index = (position - 1) * 3
+        return (self.rgb[index], self.rgb[index + 1], self.rgb[index + 2])
+
+    def rgb_list(self) -> List[Tuple[int, int, int]]:
+        """
+        Return a list of the (red, green, blue) tuple for each position
+        """
+        rgb = self.rgb
+        return [(rgb[index], rgb[index + 1], rgb[index + 2]) for index in range(0, len(rgb), 3)]
+
+    def get_color_name(self, position: int) -> str:
+        color_index = self.color[position - 1]
+
+        if color_index:
+            return COLOR_NAMES[color_index - 1]
+        else:
+            return None
+
+    def set_color_name(self, position: int, color_name: str) -> None:
+        if color_name is None:
+            self.color[position - 1] = 0
+        else:
+            self.color[position - 1] = COLOR_NAMES.index(color_name) + 1
+
+    def get_side_name(self, position: int) -> str:
+        color_name = self.get_color_name(position)
+
+        if color_name is None or self.color_to_side_name is None:
+            return None
+        else:
+            return self.color_to_side_name[color_name]
+
+    def side(self, name: str) -> Side:
+        """
+        Return a Side populated with Square objects for this cube. This is for
+        debugging, the squares are copies and changing them does not change the
+        PackedCube.
+        """
+        side = Side(self.width, name)
+
+        for position in range(side.min_pos, side.max_pos + 1):
+            (red, green, blue) = self.get_rgb(position)
+            side.set_square(
+                position,
+                red,
+                green,
+                blue,
+                side_name=self.get_side_name(position),
+                color_name=self.get_color_name(position),
+            )
+
+        return side
+
+    def square(self, position: int) -> Square:
+        """
+        Return a Square object for position, see side()
+        """
+        (red, green, blue) = self.get_rgb(position)
+        return Square(
+            position,
+            red,
+            green,
+            blue,
+            side_name=self.get_side_name(position),
+            color_name=self.get_color_name(position),
+        )
+
+    def cube_for_kociemba_strict(self) -> List[str]:
+        squares_per_side = self.width * self.width
+        data = []
+
+        # kociemba order is U R F D L B
+        for side_index in (0, 3, 2, 5, 1, 4):
+            min_pos = (side_index * squares_per_side) + 1
+
+            for position in range(min_pos, min_pos + squares_per_side):
+                data.append(self.get_side_name(position))
+
+        return data
+
+
+def load_scan(scan: Union[str, bytes, Dict]) -> PackedCube:
+    """
+    Parse and validate a scan and return it as a PackedCube. scan is either the JSON
+    used by the files in tests/test-data, an object of "position": [red, green, blue]
+    for every square, or the dictionary it decodes to. The positions may be integers
+    or strings.
+
+    Raise a ValueError if scan is not valid JSON, the number of squares is not
+    6 * width * width for one of SUPPORTED_WIDTHS, or a position or RGB value is
+    invalid. The RGB values are checked and copied into the PackedCube in a single
+    pass over the squares.
+    """
+    if isinstance(scan, (str, bytes)):
+        try:
+            scan = json_loads(scan)
+        except ValueError as e:
+            raise ValueError("scan is not valid JSON: {}".format(e))
+
+    if not isinstance(scan, dict):
+        raise ValueError("scan must be an object of position: [red, green, blue]")
+
+    square_count = len(scan)
+    width = int(sqrt(square_count / 6) + 0.5)
+
+    if width < 2 or width * width * 6 != square_count:
+        raise ValueError("scan has {} squares, that is not 6 * width * width".format(square_count))
+
+    if width not in SUPPORTED_WIDTHS:
+        raise ValueError(
+            "{}x{}x{} cubes are not supported, the width must be one of {}".format(
+                width, width, width, ", ".join([str(x) for x in SUPPORTED_WIDTHS])
+            )
+        )
+
+    packed = PackedCube(width)
+    rgb = packed.rgb
+    seen = bytearray(square_count)
+
+    for (position, value) in scan.items():
+        try:
+            position = int(position)
+        except ValueError:
+            raise ValueError("invalid position {}".format(position))
+
+        if position < 1 or position > square_count or seen[position - 1]:
+            raise ValueError("invalid or duplicate position {}".format(position))
+
+        seen[position - 1] = 1
+
+        validate_rgb(position, value)
+        index = (position - 1) * 3
+        rgb[index] = value[0]
+        rgb[index + 1] = value[1]
+        rgb[index + 2] = value[2]
+
+    return packed
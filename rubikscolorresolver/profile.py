@@ -6,11 +6,21 @@ from rubikscolorresolver.profile import timed_function
 @timed_function
 def some_slow_function():
     pass
+
+For the stages of RubiksColorSolverGeneric.crunch_colors() set the cube's
+stage_timings to a StageTimings, see StageTimings below.
 """
 
 # standard libraries
 import sys
 
+try:
+    # standard libraries
+    from typing import Callable, Dict
+except ImportError:
+    # this will barf for micropython...ignore it
+    pass
+
 stack_history = {}
 profile_stats_time_excluding_children = {}
 profile_stats_time_including_children = {}
@@ -19,58 +29,48 @@ timed_function_stack = []
 
 if sys.implementation.name == "micropython":
     # third party libraries
-    import utime
-
-    def timed_function(f, *args, **kwargs):
-        myname = str(f).split(" ")[1]
-
-        def new_func(*args, **kwargs):
-            t0 = utime.ticks_us()
-            timed_function_stack.append(myname)
-            result = f(*args, **kwargs)
+    from utime import ticks_diff, ticks_us
 
-            if myname not in profile_stats_time_including_children:
-                profile_stats_time_including_children[myname] = 0
-                profile_stats_calls[myname] = 0
-
-            t1 = utime.ticks_us()
-            delta_us = utime.ticks_diff(t1, t0)
-            profile_stats_time_including_children[myname] += delta_us
-            profile_stats_calls[myname] += 1
+else:
+    # standard libraries
+    from time import perf_counter_ns
 
-            if len(timed_function_stack) >= 2:
-                stack_last_two = tuple(timed_function_stack[-2:])
+    def ticks_us() -> int:
+        return perf_counter_ns() // 1000
 
-                if stack_last_two not in stack_history:
-                    stack_history[stack_last_two] = 0
-                stack_history[stack_last_two] += delta_us
+    def ticks_diff(t1: int, t0: int) -> int:
+        return t1 - t0
 
-            timed_function_stack.pop()
 
-            return result
+def timed_function(f, *args, **kwargs):
+    myname = str(f).split(" ")[1]
 
-        return new_func
+    def new_func(*args, **kwargs):
+        t0 = ticks_us()
+        timed_function_stack.append(myname)
+        result = f(*args, **kwargs)
 
-else:
-    # import time
+        if myname not in profile_stats_time_including_children:
+            profile_stats_time_including_children[myname] = 0
+            profile_stats_calls[myname] = 0
 
-    def timed_function(f, *args, **kwargs):
-        # myname = str(f).split(' ')[1]
+        t1 = ticks_us()
+        delta_us = ticks_diff(t1, t0)
+        profile_stats_time_including_children[myname] += delta_us
+        profile_stats_calls[myname] += 1
 
-        def new_func(*args, **kwargs):
-            # t = utime.ticks_us()
-            result = f(*args, **kwargs)
+        if len(timed_function_stack) >= 2:
+            stack_last_two = tuple(timed_function_stack[-2:])
 
-            # if myname not in profile_stats_time_including_children:
-            #    profile_stats_time_including_children[myname] = 0
-            #    profile_stats_calls[myname] = 0
+            if stack_last_two not in stack_history:
+                stack_history[stack_last_two] = 0
+            stack_history[stack_last_two] += delta_us
 
-            # profile_stats_time_including_children[myname] += utime.ticks_diff(utime.ticks_us(), t)
-            # profile_stats_calls[myname] += 1
+        timed_function_stack.pop()
 
-            return result
+        return result
 
-        return new_func
+    return new_func
 
 
 def get_time_to_subtract(function):
@@ -109,3 +109,87 @@ def print_profile_data():
 
     lines = sorted(lines)
     print("\n".join(lines))
+
+
+class StageTimings(object):
+    """
+    The wall time (in microseconds) and the number of calls of each stage of
+    crunch_colors(). Nothing is timed unless the cube's stage_timings is set:
+
+        cube.stage_timings = StageTimings()
+        cube.crunch_colors()
+        cube.stage_timings.as_dict()
+
+    The timings add up over every crunch_colors() call, use one StageTimings per
+    scan for per scan numbers or share one (or merge() them) for a batch.
+    """
+
+    __slots__ = ("scans", "time_us", "calls")
+
+    def __init__(self) -> None:
+        self.scans = 0
+        self.time_us = {}
+        self.calls = {}
+
+    def __str__(self) -> str:
+        lines = [
+            "    time(ms)     calls  stage",
+            "============  ========  =======================",
+        ]
+
+        for (stage, time_us) in self.time_us.items():
+            lines.append("{:>12.2f}  {:>8}  {}".format(time_us / 1000, self.calls[stage], stage))
+
+        lines.append("{} scans".format(self.scans))
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def call(self, stage: str, function: Callable):
+        """
+        Call function and add its wall time to stage
+        """
+        t0 = ticks_us()
+        result = function()
+        delta_us = ticks_diff(ticks_us(), t0)
+
+        if stage in self.time_us:
+            self.time_us[stage] += delta_us
+            self.calls[stage] += 1
+        else:
+            self.time_us[stage] = delta_us
+            self.calls[stage] = 1
+
+        return result
+
+    def merge(self, other) -> None:
+        """
+        Add the timings from other, a StageTimings or the dictionary from its as_dict()
+        """
+        if isinstance(other, StageTimings):
+            other = other.as_dict()
+
+        self.scans += other["scans"]
+
+        for (stage, stats) in other["stages"].items():
+            self.time_us[stage] = self.time_us.get(stage, 0) + stats["time_us"]
+            self.calls[stage] = self.calls.get(stage, 0) + stats["calls"]
+
+    def as_dict(self) -> Dict:
+        return {
+            "scans": self.scans,
+            "stages": {
+                stage: {"time_us": time_us, "calls": self.calls[stage]} for (stage, time_us) in self.time_us.items()
+            },
+        }
+
+    def to_json(self) -> str:
+        try:
+            # standard libraries
+            from json import dumps as json_dumps
+        except ImportError:
+            # third party libraries
+            from ujson import dumps as json_dumps
+
+        return json_dumps(self.as_dict())
@@ -0,0 +1,379 @@
+"""
+A resolver daemon, start it with:
+
+    rubiks-color-resolver.py --serve [--socket PATH | --port PORT] [--workers N]
+
+The interpreter, the lookup tables and the geometry for each cube width are loaded
+once per worker process and then reused for every request, so a request only pays
+for resolving the scan.
+
+Every message in either direction is a 4 byte big-endian length followed by that
+many bytes of UTF-8 JSON. A request is
+
+    {"scan": {"1": [red, green, blue], ...}, "json": false, "metric": "euclidean"}
+
+where "json" and "metric" are optional. The response is {"kociemba": "..."}, or the
+cube_for_json() dictionary if "json" is true, or {"error": "..."} if the request
+could not be resolved. Every response also has "latency_us", the microseconds from
+reading the request to having its response. {"command": "stats"} returns the number
+of requests and their latency.
+
+A connection may send any number of requests, they are answered in order. Several
+connections are served at once, the scans are resolved by a pool of worker processes.
+
+This uses asyncio and multiprocessing so it does not run on micropython.
+"""
+
+# standard libraries
+import asyncio
+import logging
+import os
+import signal
+import socket
+import stat
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from json import dumps as json_dumps
+from json import loads as json_loads
+from typing import Dict, Union
+
+# rubiks cube libraries
+from rubikscolorresolver.metric import get_metric
+from rubikscolorresolver.packed import load_scan
+from rubikscolorresolver.profile import ticks_diff, ticks_us
+from rubikscolorresolver.solver import SUPPORTED_WIDTHS, _resolve_many_worker_init, _resolve_scan, worker_cubes
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = "/tmp/rubiks-color-resolver.sock"
+HOST = "127.0.0.1"
+
+# A 7x7x7 scan is about 6KB, anything this large is not a scan
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+# The number of recent latencies the percentiles in stats() are computed from
+LATENCY_WINDOW = 1024
+
+header = struct.Struct(">I")
+
+
+def encode_message(message: Dict) -> bytes:
+    body = json_dumps(message).encode("utf-8")
+    return header.pack(len(body)) + body
+
+
+def _serve_worker_init() -> None:
+    # Ctrl-C is sent to the workers too, leave it to the server to shut them down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _resolve_many_worker_init(SUPPORTED_WIDTHS)
+
+
+def _serve_worker(scan: Dict, use_json: bool, metric: str) -> Dict:
+    """
+    Resolve one scan in a worker process
+    """
+    try:
+        packed = load_scan(scan)
+
+        # load_scan() already validated the scan
+        result = _resolve_scan(worker_cubes, packed, use_json=use_json, validate=False, metric=metric)
+
+        if use_json:
+            return result
+        else:
+            return {"kociemba": result}
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
+class ResolverServer(object):
+    """
+    Accepts connections on a unix socket and/or a TCP port and hands each request to
+    a pool of worker processes. metric is used for requests that do not have one.
+    """
+
+    def __init__(self, workers: int = None, metric: str = "euclidean") -> None:
+        get_metric(metric)
+        self.metric = metric
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        self.servers = []
+        self.socket_paths = []
+        self.client_tasks = set()
+        self.requests = 0
+        self.errors = 0
+        self.latency_total_us = 0
+        self.latency_max_us = 0
+        self.latencies_us = deque((), LATENCY_WINDOW)
+
+    def __str__(self) -> str:
+        return "ResolverServer({} workers, {})".format(self.workers, self.metric)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def start_executor(self) -> None:
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_serve_worker_init)
+
+        # The workers are only started as they are needed, submit a job to each one
+        # so the first requests do not pay for the imports
+        for _ in range(self.workers):
+            self.executor.submit(os.getpid)
+
+    async def start_unix(self, path: str = SOCKET_PATH) -> None:
+        # a socket left behind by a server that did not shut down cleanly is removed,
+        # anything else at path is left alone
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise ValueError("{} exists and is not a socket".format(path))
+
+            os.unlink(path)
+
+        self.servers.append(await asyncio.start_unix_server(self.handle_client, path=path))
+        self.socket_paths.append(path)
+        logger.info("{} listening on {}".format(self, path))
+
+    async def start_tcp(self, port: int, host: str = HOST) -> None:
+        self.servers.append(await asyncio.start_server(self.handle_client, host=host, port=port))
+        logger.info("{} listening on {}:{}".format(self, host, port))
+
+    async def close(self) -> None:
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+
+        # the connections are closed by their handle_client()
+        for task in self.client_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.client_tasks, return_exceptions=True)
+
+        for path in self.socket_paths:
+            if os.path.exists(path):
+                os.unlink(path)
+
+        self.servers = []
+        self.socket_paths = []
+
+        if self.executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+            self.executor = None
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        result = {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_mean_us": int(self.latency_total_us / self.requests) if self.requests else 0,
+            "latency_max_us": self.latency_max_us,
+        }
+        latencies_us = sorted(self.latencies_us)
+
+        for percentile in (50, 99):
+            if latencies_us:
+                result["latency_p{}_us".format(percentile)] = latencies_us[(len(latencies_us) - 1) * percentile // 100]
+            else:
+                result["latency_p{}_us".format(percentile)] = 0
+
+        return result
+
+    def parse_request(self, body: bytes) -> Dict:
+        """
+        Return the request with its "metric" filled in, raise a ValueError if it is not valid
+        """
+        try:
+            request = json_loads(body)
+        except ValueError as e:
+            raise ValueError("request is not valid JSON: {}".format(e))
+
+        if not isinstance(request, dict) or ("scan" not in request and "command" not in request):
+            raise ValueError('request must be an object with a "scan" or a "command"')
+
+        if "command" in request and request["command"] != "stats":
+            raise ValueError("invalid command {}".format(request["command"]))
+
+        request["metric"] = request.get("metric", self.metric)
+
+        if not isinstance(request["metric"], str):
+            raise ValueError("metric must be a string, it is {}".format(request["metric"]))
+
+        get_metric(request["metric"])
+        return request
+
+    async def resolve(self, body: bytes) -> Dict:
+        """
+        Return the response to the request in body, the scan is resolved by one of the
+        workers while the event loop carries on with the other connections
+        """
+        t0 = ticks_us()
+
+        try:
+            request = self.parse_request(body)
+
+            if "command" in request:
+                return self.stats()
+
+            executor = self.executor
+            response = await asyncio.get_running_loop().run_in_executor(
+                executor, _serve_worker, request["scan"], bool(request.get("json")), request["metric"]
+            )
+        except ValueError as e:
+            response = {"error": str(e)}
+        except BrokenProcessPool as e:
+            # A worker died, the pool can not be used again. Start a new one unless one
+            # of the other requests that were using the old pool already did.
+            response = {"error": "{}: {}".format(e.__class__.__name__, e)}
+
+            if self.executor is executor:
+                logger.error("a worker died, restarting the worker pool")
+                self.start_executor()
+                await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+        except Exception as e:
+            # the client still gets a reply
+            logger.exception("request failed")
+            response = {"error": "{}: {}".format(e.__class__.__name__, e)}
+
+        latency_us = ticks_diff(ticks_us(), t0)
+        self.requests += 1
+        self.latency_total_us += latency_us
+        self.latencies_us.append(latency_us)
+
+        if latency_us > self.latency_max_us:
+            self.latency_max_us = latency_us
+
+        if "error" in response:
+            self.errors += 1
+            logger.warning("request failed after {}us: {}".format(latency_us, response["error"]))
+        else:
+            logger.debug("request took {}us".format(latency_us))
+
+        response["latency_us"] = latency_us
+        return response
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self.client_tasks.add(task)
+
+        try:
+            while True:
+                try:
+                    (length,) = header.unpack(await reader.readexactly(header.size))
+                except asyncio.IncompleteReadError:
+                    break
+
+                if length > MAX_MESSAGE_SIZE:
+                    writer.write(
+                        encode_message({"error": "message is {} bytes, the max is {}".format(length, MAX_MESSAGE_SIZE)})
+                    )
+                    break
+
+                try:
+                    body = await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    break
+
+                writer.write(encode_message(await self.resolve(body)))
+                await writer.drain()
+
+        except (ConnectionError, asyncio.CancelledError):
+            # the client went away, or close() cancelled this because the server is shutting down
+            pass
+
+        finally:
+            writer.close()
+
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+            self.client_tasks.discard(task)
+
+
+def serve(socket_path: str = None, port: int = None, workers: int = None, metric: str = "euclidean") -> None:
+    """
+    Run a ResolverServer until it gets a SIGINT or SIGTERM. It listens on socket_path,
+    and on port on localhost if port is not None, or on SOCKET_PATH if neither is given.
+    """
+    server = ResolverServer(workers, metric)
+    server.start_executor()
+    loop = asyncio.new_event_loop()
+
+    try:
+        if socket_path is not None or port is None:
+            loop.run_until_complete(server.start_unix(socket_path or SOCKET_PATH))
+
+        if port is not None:
+            loop.run_until_complete(server.start_tcp(port))
+
+        loop.add_signal_handler(signal.SIGTERM, loop.stop)
+        loop.run_forever()
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        loop.run_until_complete(server.close())
+        loop.close()
+        logger.info("{} stats {}".format(server, server.stats()))
+
+
+class ResolverClient(object):
+    """
+    A blocking client for a ResolverServer, for callers that do not use asyncio:
+
+        with ResolverClient() as client:
+            client.resolve(scan_data)["kociemba"]
+    """
+
+    def __init__(self, socket_path: str = None, port: int = None, host: str = HOST, timeout: float = None) -> None:
+        if port is None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path or SOCKET_PATH)
+        else:
+            self.sock = socket.create_connection((host, port), timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def recv_exactly(self, size: int) -> bytes:
+        data = b""
+
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+
+            if not chunk:
+                raise ConnectionError("server closed the connection")
+
+            data += chunk
+
+        return data
+
+    def request(self, message: Dict) -> Dict:
+        self.sock.sendall(encode_message(message))
+        (length,) = header.unpack(self.recv_exactly(header.size))
+        return json_loads(self.recv_exactly(length))
+
+    def resolve(self, scan: Dict, use_json: bool = False, metric: str = None) -> Dict:
+        message = {"scan": scan}
+
+        if use_json:
+            message["json"] = True
+
+        if metric is not None:
+            message["metric"] = metric
+
+        return self.request(message)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        return self.request({"command": "stats"})
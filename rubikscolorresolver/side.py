@@ -1,8 +1,31 @@
 # rubiks cube libraries
+from rubikscolorresolver.color import LabColor
 from rubikscolorresolver.square import Square
 
 
 class Side(object):
+    __slots__ = (
+        "name",
+        "color",
+        "squares",
+        "width",
+        "squares_per_side",
+        "center_squares",
+        "edge_squares",
+        "corner_squares",
+        "wing_partner",
+        "min_pos",
+        "max_pos",
+        "mid_pos",
+        "corner_pos",
+        "edge_pos",
+        "edge_north_pos",
+        "edge_west_pos",
+        "edge_south_pos",
+        "edge_east_pos",
+        "center_pos",
+    )
+
     def __init__(self, width: int, name: str) -> None:
         self.name = name  # U, L, etc
         self.color = None
@@ -87,10 +110,27 @@ class Side(object):
     def __repr__(self) -> str:
         return self.__str__()
 
+    def reset(self) -> None:
+        """
+        Forget the squares from the previous scan so this side can be reused
+        """
+        self.color = None
+        self.squares = {}
+        self.center_squares = []
+        self.edge_squares = []
+        self.corner_squares = []
+
     def set_square(
-        self, position: int, red: int, green: int, blue: int, side_name: None = None, color_name: None = None
+        self,
+        position: int,
+        red: int,
+        green: int,
+        blue: int,
+        side_name: None = None,
+        color_name: None = None,
+        lab: LabColor = None,
     ) -> None:
-        self.squares[position] = Square(position, red, green, blue, side_name=side_name, color_name=color_name)
+        self.squares[position] = Square(position, red, green, blue, side_name=side_name, color_name=color_name, lab=lab)
 
         if position in self.center_pos:
             self.center_squares.append(self.squares[position])
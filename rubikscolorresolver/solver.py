@@ -6,27 +6,39 @@ from math import sqrt
 
 try:
     # standard libraries
-    from typing import Dict, List, Tuple, Union
+    from typing import Dict, Iterable, Iterator, List, Tuple, Union
 except ImportError:
     # this will barf for micropython...ignore it
     pass
 
 # rubiks cube libraries
-from rubikscolorresolver.color import LabColor, html_color, lab_distance, rgb2lab
-from rubikscolorresolver.cube import RubiksCube
-from rubikscolorresolver.permutations import (
-    even_cube_center_color_permutations,
-    len_even_cube_center_color_permutations,
-    odd_cube_center_color_permutations,
+from rubikscolorresolver.assignment import best_swap_improvement, hungarian, min_cost_permutation
+from rubikscolorresolver.color import (
+    LabColor,
+    html_color,
+    lab_distance,
+    lab_distance_matrix,
+    numpy,
+    rgb2lab,
+    rgb_list_to_lab,
 )
+from rubikscolorresolver.cube import RubiksCube
+from rubikscolorresolver.distance import DistanceCache
+from rubikscolorresolver.metric import METRICS, get_metric
+from rubikscolorresolver.packed import SUPPORTED_WIDTHS, PackedCube, load_scan
+from rubikscolorresolver.profile import StageTimings
 from rubikscolorresolver.square import Square
 from rubikscolorresolver.tsp_solver_greedy import solve_tsp
-from rubikscolorresolver.www import HTML_FILENAME, WwwMixin, crayola_colors, open_mode
+from rubikscolorresolver.www import WwwMixin, crayola_colors
 
 logger = logging.getLogger(__name__)
 
 ALL_COLORS = ("Bu", "Gr", "OR", "Rd", "Wh", "Ye")
 
+# The ways the squares of two corners (or two edge pairs) can be lined up with each other
+CORNER_ROTATIONS = ((0, 1, 2), (2, 0, 1), (1, 2, 0))
+EDGE_PAIR_ROTATIONS = ((0, 1), (1, 0))
+
 
 def median(list_foo: List[float]) -> float:
     list_foo = sorted(list_foo)
@@ -44,7 +56,124 @@ def median(list_foo: List[float]) -> float:
         return list_foo[int((list_foo_len - 1) / 2)]
 
 
-def tsp_matrix_corners(corners: List[Union[Tuple[Square, Square, Square], List[Square]]]) -> List[List[int]]:
+def square_distance(square1: Square, square2: Square) -> int:
+    return lab_distance(square1.lab, square2.lab)
+
+
+def square_distance_matrix(squares1: List[Square], squares2: List[Square], cache: DistanceCache = None):
+    """
+    lab_distance_matrix() of the squares, from the cache if there is one. Requires numpy.
+    """
+    if cache is None:
+        return lab_distance_matrix([square.lab for square in squares1], [square.lab for square in squares2])
+    else:
+        return cache.matrix(squares1, squares2)
+
+
+def tsp_matrix_vectorized(
+    groups: List[Tuple[Square]], rotations: Tuple[Tuple[int]], cache: DistanceCache = None
+) -> List[List[int]]:
+    """
+    Vectorized version of tsp_matrix_corners() and tsp_matrix_edge_pairs(), requires numpy.
+
+    groups is a list of corners or edge pairs. The distance between two groups is the
+    minimum, over each way of lining up their squares (rotations), of the total
+    lab_distance() between the lined up squares. Two groups that both came from the
+    color_box (or that both did not) are 9999 apart.
+    """
+    len_groups = len(groups)
+    len_group = len(groups[0])
+    squares = [square for group in groups for square in group]
+
+    # distances[x][i][y][j] is the distance from square i of group x to square j of group y
+    distances = square_distance_matrix(squares, squares, cache).reshape(len_groups, len_group, len_groups, len_group)
+    matrix = None
+
+    for rotation in rotations:
+        rotation_distance = sum(distances[:, i, :, j] for (i, j) in enumerate(rotation))
+
+        if matrix is None:
+            matrix = rotation_distance
+        else:
+            matrix = numpy.minimum(matrix, rotation_distance)
+
+    via_color_box = numpy.array([group[0].via_color_box for group in groups])
+    matrix[via_color_box[:, None] == via_color_box[None, :]] = 9999
+    numpy.fill_diagonal(matrix, 0)
+    return matrix.tolist()
+
+
+def tsp_matrix_groups(
+    groups: List[Tuple[Square]], rotations: Tuple[Tuple[int]], cache: DistanceCache
+) -> List[List[int]]:
+    """
+    Pure python version of tsp_matrix_vectorized() that reads the distances between
+    the squares from a DistanceCache. Only the distances that are needed are looked
+    up, the work of DistanceCache.get() is done inline.
+    """
+    len_groups = len(groups)
+    indexes = [[cache.index(square) for square in group] for group in groups]
+    lab_distance = cache.metric.distance
+    labs = cache.labs
+    table = cache.table
+    row_start = cache.row_start
+    lookups = 0
+    misses = 0
+    matrix = [[0] * len_groups for x in range(len_groups)]
+
+    for x in range(len_groups):
+        x_indexes = indexes[x]
+        x_via_color_box = groups[x][0].via_color_box
+
+        for y in range(x + 1, len_groups):
+            if x_via_color_box == groups[y][0].via_color_box:
+                distance = 9999
+            else:
+                y_indexes = indexes[y]
+                distance = None
+
+                for rotation in rotations:
+                    rotation_distance = 0
+
+                    for (i, j) in enumerate(rotation):
+                        a = x_indexes[i]
+                        b = y_indexes[j]
+
+                        if b <= a:
+                            table_index = row_start[a] + b
+                        else:
+                            table_index = row_start[b] + a
+
+                        square_distance = table[table_index]
+
+                        if square_distance < 0:
+                            square_distance = lab_distance(labs[a], labs[b])
+                            table[table_index] = square_distance
+                            misses += 1
+
+                        rotation_distance += square_distance
+                        lookups += 1
+
+                    if distance is None or rotation_distance < distance:
+                        distance = rotation_distance
+
+            matrix[x][y] = distance
+            matrix[y][x] = distance
+
+    cache.hits += lookups - misses
+    cache.misses += misses
+    return matrix
+
+
+def tsp_matrix_corners(
+    corners: List[Union[Tuple[Square, Square, Square], List[Square]]], cache: DistanceCache = None
+) -> List[List[int]]:
+    if numpy is not None and corners:
+        return tsp_matrix_vectorized(corners, CORNER_ROTATIONS, cache)
+
+    if cache is not None:
+        return tsp_matrix_groups(corners, CORNER_ROTATIONS, cache)
+
     len_corners = len(corners)
 
     # build a full matrix of color to color distances
@@ -91,20 +220,70 @@ def tsp_matrix_corners(corners: List[Union[Tuple[Square, Square, Square], List[S
 
 
 def tsp_corner_distance(
-    corner1: Tuple[Square, Square, Square], corner2: Union[Tuple[Square, Square, Square], List[Square]]
+    corner1: Tuple[Square, Square, Square],
+    corner2: Union[Tuple[Square, Square, Square], List[Square]],
+    cache: DistanceCache = None,
 ) -> int:
+    get_distance = square_distance if cache is None else cache.distance
+
     return (
-        lab_distance(corner1[0].lab, corner2[0].lab)
-        + lab_distance(corner1[1].lab, corner2[1].lab)
-        + lab_distance(corner1[2].lab, corner2[2].lab)
+        get_distance(corner1[0], corner2[0])
+        + get_distance(corner1[1], corner2[1])
+        + get_distance(corner1[2], corner2[2])
     )
 
 
+def pair_cost_table(
+    firsts: List[Tuple[Square, ...]], seconds: List[Tuple[Square, ...]], cache: DistanceCache = None
+) -> List[List[int]]:
+    """
+    Return a table where [x][y] is the distance between the corners (or edge pairs)
+    firsts[x] and seconds[y] with their squares lined up as-is, this is the
+    tsp_corner_distance() or edge_pair_distance(normal=True) of the two
+    """
+    if numpy is not None and firsts:
+        table = 0
+
+        for index in range(len(firsts[0])):
+            table = table + square_distance_matrix(
+                [first[index] for first in firsts], [second[index] for second in seconds], cache
+            )
+
+        return table.tolist()
+
+    if cache is not None:
+        table = [[0] * len(seconds) for first in firsts]
+
+        for index in range(len(firsts[0]) if firsts else 0):
+            distances = cache.matrix([first[index] for first in firsts], [second[index] for second in seconds])
+            table = [[x + y for (x, y) in zip(row, distance_row)] for (row, distance_row) in zip(table, distances)]
+
+        return table
+
+    table = [[0] * len(seconds) for first in firsts]
+
+    for index in range(len(firsts[0]) if firsts else 0):
+        second_labs = [second[index].lab for second in seconds]
+
+        for (row, first) in zip(table, firsts):
+            first_lab = first[index].lab
+
+            for (y, second_lab) in enumerate(second_labs):
+                row[y] += lab_distance(first_lab, second_lab)
+
+    return table
+
+
 def traveling_salesman_corners(
-    corners: List[Union[Tuple[Square, Square, Square], List[Square]]], desc: str
+    corners: List[Union[Tuple[Square, Square, Square], List[Square]]],
+    desc: str,
+    optim_steps: int = 0,
+    time_budget: float = None,
+    cache: DistanceCache = None,
 ) -> List[Union[Tuple[Square, Square, Square], List[Square]]]:
-    matrix = tsp_matrix_corners(corners)
-    path = solve_tsp(matrix)
+    get_distance = square_distance if cache is None else cache.distance
+    matrix = tsp_matrix_corners(corners, cache)
+    path = solve_tsp(matrix, optim_steps=optim_steps, time_budget=time_budget)
     sorted_corners = [corners[x] for x in path]
 
     for x in range(0, len(sorted_corners), 2):
@@ -112,21 +291,21 @@ def traveling_salesman_corners(
         corner2 = sorted_corners[x + 1]
 
         distance_012 = (
-            lab_distance(corner1[0].lab, corner2[0].lab)
-            + lab_distance(corner1[1].lab, corner2[1].lab)
-            + lab_distance(corner1[2].lab, corner2[2].lab)
+            get_distance(corner1[0], corner2[0])
+            + get_distance(corner1[1], corner2[1])
+            + get_distance(corner1[2], corner2[2])
         )
 
         distance_201 = (
-            lab_distance(corner1[0].lab, corner2[2].lab)
-            + lab_distance(corner1[1].lab, corner2[0].lab)
-            + lab_distance(corner1[2].lab, corner2[1].lab)
+            get_distance(corner1[0], corner2[2])
+            + get_distance(corner1[1], corner2[0])
+            + get_distance(corner1[2], corner2[1])
         )
 
         distance_120 = (
-            lab_distance(corner1[0].lab, corner2[1].lab)
-            + lab_distance(corner1[1].lab, corner2[2].lab)
-            + lab_distance(corner1[2].lab, corner2[0].lab)
+            get_distance(corner1[0], corner2[1])
+            + get_distance(corner1[1], corner2[2])
+            + get_distance(corner1[2], corner2[0])
         )
 
         distance = min(distance_012, distance_201, distance_120)
@@ -143,44 +322,51 @@ def traveling_salesman_corners(
         else:
             raise ValueError(distance)
 
-    while True:
-        max_delta = 0
-        max_delta_corners_to_swap = None
-
-        for x in range(0, len(sorted_corners), 2):
-            corner1 = sorted_corners[x]
-            corner2 = sorted_corners[x + 1]
-            distance12 = tsp_corner_distance(corner1, corner2)
+    # Swap the second corners of the pairs while that lowers the total distance
+    seconds = sorted_corners[1::2]
+    swaps = best_swap_improvement(pair_cost_table(sorted_corners[0::2], seconds, cache))
 
-            for y in range(x + 2, len(sorted_corners), 2):
-                corner3 = sorted_corners[y]
-                corner4 = sorted_corners[y + 1]
-                distance34 = tsp_corner_distance(corner3, corner4)
+    for (x, y) in enumerate(swaps):
+        sorted_corners[(x * 2) + 1] = seconds[y]
 
-                # If we were to swap corner2 with corner4, what would that do to the corner1->corner2 distance plus the corner3->corner4 distance?  # noqa: E501
-                distance14 = tsp_corner_distance(corner1, corner4)
-                distance32 = tsp_corner_distance(corner3, corner2)
+    return sorted_corners
 
-                if distance14 + distance32 < distance12 + distance34:
-                    delta = (distance12 + distance34) - (distance14 + distance32)
 
-                    if delta > max_delta:
-                        max_delta = delta
-                        max_delta_corners_to_swap = (x + 1, y + 1)
+def hungarian_corners(
+    target_corners: List[Tuple[Square, Square, Square]],
+    corners: List[Tuple[Square, Square, Square]],
+    cache: DistanceCache = None,
+) -> List[Tuple[Square, Square, Square]]:
+    """
+    Pair each target corner with a scanned corner so that the total distance, with
+    each scanned corner in its best rotation, is minimal. Returns the same
+    [target, corner, target, corner, ...] list as traveling_salesman_corners().
+    """
+    len_targets = len(target_corners)
+    matrix = tsp_matrix_corners(target_corners + corners, cache)
+    costs = [row[len_targets:] for row in matrix[:len_targets]]
+    sorted_corners = []
+
+    for (target, index) in zip(target_corners, hungarian(costs)):
+        corner = corners[index]
+        rotations = (
+            (corner[0], corner[1], corner[2]),
+            (corner[2], corner[0], corner[1]),
+            (corner[1], corner[2], corner[0]),
+        )
+        sorted_corners.append(target)
+        sorted_corners.append(min(rotations, key=lambda rotation: tsp_corner_distance(target, rotation, cache)))
 
-        if max_delta_corners_to_swap:
-            (x, y) = max_delta_corners_to_swap
-            orig_x = sorted_corners[x]
-            sorted_corners[x] = sorted_corners[y]
-            sorted_corners[y] = orig_x
+    return sorted_corners
 
-        else:
-            break
 
-    return sorted_corners
+def tsp_matrix_edge_pairs(edge_pairs: List[Tuple[Square, Square]], cache: DistanceCache = None) -> List[List[int]]:
+    if numpy is not None and edge_pairs:
+        return tsp_matrix_vectorized(edge_pairs, EDGE_PAIR_ROTATIONS, cache)
 
+    if cache is not None:
+        return tsp_matrix_groups(edge_pairs, EDGE_PAIR_ROTATIONS, cache)
 
-def tsp_matrix_edge_pairs(edge_pairs: List[Tuple[Square, Square]]) -> List[List[int]]:
     len_edge_pairs = len(edge_pairs)
 
     # build a full matrix of color to color distances
@@ -210,23 +396,33 @@ def tsp_matrix_edge_pairs(edge_pairs: List[Tuple[Square, Square]]) -> List[List[
     return matrix
 
 
-def edge_pair_distance(pair1: Tuple[Square, Square], pair2: Tuple[Square, Square], normal: bool) -> int:
+def edge_pair_distance(
+    pair1: Tuple[Square, Square], pair2: Tuple[Square, Square], normal: bool, cache: DistanceCache = None
+) -> int:
+    get_distance = square_distance if cache is None else cache.distance
+
     if normal:
-        return lab_distance(pair1[0].lab, pair2[0].lab) + lab_distance(pair1[1].lab, pair2[1].lab)
+        return get_distance(pair1[0], pair2[0]) + get_distance(pair1[1], pair2[1])
     else:
-        return lab_distance(pair1[0].lab, pair2[1].lab) + lab_distance(pair1[1].lab, pair2[0].lab)
-
-
-def traveling_salesman_edge_pairs(edge_pairs: List[Tuple[Square, Square]], desc: str) -> List[Tuple[Square, Square]]:
-    matrix = tsp_matrix_edge_pairs(edge_pairs)
-    path = solve_tsp(matrix)
+        return get_distance(pair1[0], pair2[1]) + get_distance(pair1[1], pair2[0])
+
+
+def traveling_salesman_edge_pairs(
+    edge_pairs: List[Tuple[Square, Square]],
+    desc: str,
+    optim_steps: int = 0,
+    time_budget: float = None,
+    cache: DistanceCache = None,
+) -> List[Tuple[Square, Square]]:
+    matrix = tsp_matrix_edge_pairs(edge_pairs, cache)
+    path = solve_tsp(matrix, optim_steps=optim_steps, time_budget=time_budget)
     sorted_edge_pairs = [edge_pairs[x] for x in path]
 
     for x in range(0, len(sorted_edge_pairs), 2):
         pair1 = sorted_edge_pairs[x]
         pair2 = sorted_edge_pairs[x + 1]
-        distance_01 = edge_pair_distance(pair1, pair2, normal=True)
-        distance_10 = edge_pair_distance(pair1, pair2, normal=False)
+        distance_01 = edge_pair_distance(pair1, pair2, True, cache)
+        distance_10 = edge_pair_distance(pair1, pair2, False, cache)
 
         if distance_10 < distance_01:
             sorted_edge_pairs[x + 1] = (
@@ -234,44 +430,50 @@ def traveling_salesman_edge_pairs(edge_pairs: List[Tuple[Square, Square]], desc:
                 sorted_edge_pairs[x + 1][0],
             )
 
-    while True:
-        max_delta = 0
-        max_delta_edges_to_swap = None
-
-        for x in range(0, len(sorted_edge_pairs), 2):
-            pair1 = sorted_edge_pairs[x]
-            pair2 = sorted_edge_pairs[x + 1]
-            distance12 = edge_pair_distance(pair1, pair2, True)
+    # Swap the second edge pairs of the pairs while that lowers the total distance
+    seconds = sorted_edge_pairs[1::2]
+    swaps = best_swap_improvement(pair_cost_table(sorted_edge_pairs[0::2], seconds, cache))
 
-            for y in range(x + 2, len(sorted_edge_pairs), 2):
-                pair3 = sorted_edge_pairs[y]
-                pair4 = sorted_edge_pairs[y + 1]
-                distance34 = edge_pair_distance(pair3, pair4, True)
+    for (x, y) in enumerate(swaps):
+        sorted_edge_pairs[(x * 2) + 1] = seconds[y]
 
-                # If we were to swap pair2 with pair4, what would that do to the pair1->pair2 distance plus the pair3->pair4 distance?  # noqa: E501
-                distance14 = edge_pair_distance(pair1, pair4, True)
-                distance32 = edge_pair_distance(pair3, pair2, True)
+    return sorted_edge_pairs
 
-                if distance14 + distance32 < distance12 + distance34:
-                    delta = (distance12 + distance34) - (distance14 + distance32)
 
-                    if delta > max_delta:
-                        max_delta = delta
-                        max_delta_edges_to_swap = (x + 1, y + 1)
+def hungarian_edge_pairs(
+    target_edge_pairs: List[Tuple[Square, Square]],
+    edge_pairs: List[Tuple[Square, Square]],
+    cache: DistanceCache = None,
+) -> List[Tuple[Square, Square]]:
+    """
+    Pair each target edge pair with a scanned edge pair so that the total distance,
+    with each scanned edge pair in its best orientation, is minimal. Returns the same
+    [target, pair, target, pair, ...] list as traveling_salesman_edge_pairs().
+    """
+    len_targets = len(target_edge_pairs)
+    matrix = tsp_matrix_edge_pairs(target_edge_pairs + edge_pairs, cache)
+    costs = [row[len_targets:] for row in matrix[:len_targets]]
+    sorted_edge_pairs = []
 
-        if max_delta_edges_to_swap:
-            (x, y) = max_delta_edges_to_swap
-            orig_x = sorted_edge_pairs[x]
-            sorted_edge_pairs[x] = sorted_edge_pairs[y]
-            sorted_edge_pairs[y] = orig_x
+    for (target, index) in zip(target_edge_pairs, hungarian(costs)):
+        pair = edge_pairs[index]
+        sorted_edge_pairs.append(target)
 
+        if edge_pair_distance(target, pair, False, cache) < edge_pair_distance(target, pair, True, cache):
+            sorted_edge_pairs.append((pair[1], pair[0]))
         else:
-            break
+            sorted_edge_pairs.append(pair)
 
     return sorted_edge_pairs
 
 
-def tsp_matrix(squares: List[Square]) -> Tuple[Tuple[float]]:
+def tsp_matrix(squares: List[Square], cache: DistanceCache = None) -> Tuple[Tuple[float]]:
+    if numpy is not None and squares:
+        return tuple([tuple(row) for row in square_distance_matrix(squares, squares, cache).tolist()])
+
+    if cache is not None:
+        return tuple([tuple(row) for row in cache.matrix(squares, squares)])
+
     len_squares = len(squares)
     r_len_squares = range(len_squares)
 
@@ -298,9 +500,11 @@ def tsp_matrix(squares: List[Square]) -> Tuple[Tuple[float]]:
     return matrix
 
 
-def traveling_salesman(squares: List[Square]) -> List[Square]:
-    matrix = tsp_matrix(squares)
-    path = solve_tsp(matrix)
+def traveling_salesman(
+    squares: List[Square], optim_steps: int = 0, time_budget: float = None, cache: DistanceCache = None
+) -> List[Square]:
+    matrix = tsp_matrix(squares, cache)
+    path = solve_tsp(matrix, optim_steps=optim_steps, time_budget=time_budget)
     return [squares[x] for x in path]
 
 
@@ -324,25 +528,68 @@ def square_list_to_lab(squares: List[Square]) -> LabColor:
 
 class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
     def enter_scan_data(self, scan_data: Dict[int, List[int]]) -> None:
+        if self.validate:
+            self.validate_scan_data(scan_data)
+
+        self.enter_rgb_list(
+            [int(position) for position in scan_data.keys()], [tuple(rgb) for rgb in scan_data.values()]
+        )
+
+        if self.write_debug_file:
+            self.www_header()
+
+            self.write_html("<h1>RGB Input</h1>\n<pre>{}</pre>\n".format(scan_data))
+
+        self.calculate_pos2square()
+
+    def enter_rgb_list(self, positions: List[int], rgb_list: List[Tuple[int, int, int]]) -> None:
+        # Convert all of the RGB values to Lab in one pass, this is vectorized if numpy is available
+        lab_list = rgb_list_to_lab(rgb_list)
+
+        for (position, (red, green, blue), lab) in zip(positions, rgb_list, lab_list):
+            self.pos2side[position].set_square(position, red, green, blue, lab=lab)
+
+    def enter_packed_scan_data(self, packed: PackedCube) -> None:
+        """
+        Load the squares straight from packed.rgb, load_scan() and the 8-bit array
+        already guarantee every position has a valid RGB value
+        """
+        if packed.width != self.width:
+            raise ValueError("{}x{}x{} cube can not load {}".format(self.width, self.width, self.width, packed))
 
-        for (position, (red, green, blue)) in scan_data.items():
-            position = int(position)
-            side = self.pos2side[position]
-            side.set_square(position, red, green, blue)
+        self.enter_rgb_list(range(1, packed.square_count + 1), packed.rgb_list())
 
         if self.write_debug_file:
             self.www_header()
 
-            with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-                fh.write("<h1>RGB Input</h1>\n")
-                fh.write("<pre>{}</pre>\n".format(scan_data))
+            self.write_html("<h1>RGB Input</h1>\n<pre>{}</pre>\n".format(packed.rgb_list()))
 
         self.calculate_pos2square()
 
+    def save_packed(self, packed: PackedCube) -> None:
+        """
+        Store the color name assigned to each square in packed
+        """
+        for side in self.sides.values():
+            for (position, square) in side.squares.items():
+                packed.set_color_name(position, square.color_name)
+
+        packed.color_to_side_name = dict(self.color_to_side_name)
+
+    def resolve_packed(self, packed: PackedCube) -> None:
+        """
+        Resolve the colors of packed and store the results in it
+        """
+        self.enter_packed_scan_data(packed)
+        self.crunch_colors()
+        self.save_packed(packed)
+
     def set_state(self) -> None:
 
         # odd cube
         if self.sideU.mid_pos is not None:
+            # rubiks cube libraries
+            from rubikscolorresolver.permutations import odd_cube_center_color_permutations
 
             # Assign a color name to each center square. Compute
             # which naming scheme results in the least total color distance in
@@ -363,8 +610,11 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
 
                 for (index, center_square) in enumerate(center_squares):
                     color_name = permutation[index]
-                    color_obj = crayola_colors[color_name]
-                    distance += lab_distance(center_square.lab, color_obj)
+
+                    if self.distance_cache is None:
+                        distance += lab_distance(center_square.lab, crayola_colors[color_name])
+                    else:
+                        distance += self.distance_cache.color_distance(center_square, crayola_colors, color_name)
 
                 if min_distance is None or distance < min_distance:
                     min_distance = distance
@@ -447,14 +697,6 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
         which naming scheme results in the least total color distance in
         terms of the assigned color name vs. the colors in color_box.
         """
-        ref_even_cube_center_color_permutations = even_cube_center_color_permutations
-
-        def get_even_cube_center_color_permutation(permutation_index):
-            LINE_LENGTH = 18
-            start = permutation_index * LINE_LENGTH
-            end = start + LINE_LENGTH
-            return ref_even_cube_center_color_permutations[start:end].split()
-
         ref_ALL_COLORS = ALL_COLORS
 
         # squares_lists_all is sorted by color. Split that list into 6 even buckets (squares_lists).
@@ -478,9 +720,12 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
             distances_of_square_list_per_color[color_name] = []
 
             for (index, square_list) in enumerate(squares_lists):
-                distance = 0
-                for square in square_list:
-                    distance += lab_distance(square.lab, color_lab)
+                if self.distance_cache is None:
+                    distance = 0
+                    for square in square_list:
+                        distance += lab_distance(square.lab, color_lab)
+                else:
+                    distance = self.distance_cache.color_distance_sum(square_list, color_box, color_name)
                 distances_of_square_list_per_color[color_name].append(int(distance))
 
         min_distance = 99999
@@ -489,7 +734,7 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
         if color_permutations == "even_cube_center_color_permutations":
 
             # Move the squares_list row that is closest to Bu to the front, then Gr, OR, Rd, Wh, Ye.
-            # This will allow us to skip many more entries later.
+            # If two permutations have the same distance this decides which one wins.
             for (insert_index, color_name) in enumerate(ref_ALL_COLORS):
                 min_color_name_distance = 99999
                 min_color_name_distance_index = None
@@ -508,42 +753,18 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
                     distances_of_square_list_per_color[color_name].pop(min_color_name_distance_index)
                     distances_of_square_list_per_color[color_name].insert(insert_index, blue_distance)
 
-            permutation_len = len_even_cube_center_color_permutations
-            permutation_index = 0
-            r = range(6)
-
-            while permutation_index < permutation_len:
-                permutation = get_even_cube_center_color_permutation(permutation_index)
-                distance = 0
-                skip_by = 0
-
-                for x in r:
-                    distance += distances_of_square_list_per_color[permutation[x]][x]
-
-                    if distance > min_distance:
-
-                        if x == 0:
-                            skip_by = 120
-                        elif x == 1:
-                            skip_by = 24
-                        elif x == 2:
-                            skip_by = 6
-                        elif x == 3:
-                            skip_by = 2
-
-                        break
-
-                if skip_by:
-                    permutation_index += skip_by
-                    continue
-
-                if distance < min_distance:
-                    min_distance = distance
-                    min_distance_permutation = permutation
-
-                permutation_index += 1
+            # Any of the 720 permutations of the six colors is possible. Picking the one with
+            # the least total distance is a 6x6 assignment problem.
+            costs = [
+                [distances_of_square_list_per_color[color_name][index] for color_name in ref_ALL_COLORS]
+                for index in range(6)
+            ]
+            min_distance_permutation = [ref_ALL_COLORS[x] for x in min_cost_permutation(costs)]
 
         elif color_permutations == "odd_cube_center_color_permutations":
+            # rubiks cube libraries
+            from rubikscolorresolver.permutations import odd_cube_center_color_permutations
+
             for permutation in odd_cube_center_color_permutations:
                 distance = (
                     distances_of_square_list_per_color[permutation[0]][0]
@@ -629,7 +850,9 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
 
             desc = "corner squares for color_box"
             color_permutations = "even_cube_center_color_permutations"
-            squares_for_color_box = traveling_salesman(squares_for_color_box)
+            squares_for_color_box = traveling_salesman(
+                squares_for_color_box, self.tsp_optim_steps, self.tsp_time_budget, self.distance_cache
+            )
 
         self.assign_color_names(
             desc,
@@ -661,6 +884,9 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
             "Ye": square_list_to_lab(yellow_squares),
         }
 
+        if self.distance_cache is not None:
+            self.distance_cache.add_colors(self.color_box, color_box=True)
+
         # Nuke all color names (they were temporary)
         for side in self.sides.values():
             for square in side.center_squares + side.corner_squares + side.edge_squares:
@@ -766,7 +992,15 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
                 )
             )
 
-        sorted_corners = traveling_salesman_corners(target_corners + corners, "corners")
+        if self.match_method == "hungarian":
+            sorted_corners = hungarian_corners(target_corners, corners, self.distance_cache)
+        elif self.match_method == "tsp":
+            sorted_corners = traveling_salesman_corners(
+                target_corners + corners, "corners", self.tsp_optim_steps, self.tsp_time_budget, self.distance_cache
+            )
+        else:
+            raise ValueError("invalid match_method {}".format(self.match_method))
+
         # logger.info(f"sorted_corners\n{pformat(sorted_corners)}")
 
         if sorted_corners[0][0].position is None:
@@ -876,7 +1110,19 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
             else:
                 raise ValueError("found {} edge pairs".format(len(edge_pairs)))
 
-            sorted_edge_pairs = traveling_salesman_edge_pairs(target_edge_pairs + edge_pairs, "edge pairs")
+            if self.match_method == "hungarian":
+                sorted_edge_pairs = hungarian_edge_pairs(target_edge_pairs, edge_pairs, self.distance_cache)
+            elif self.match_method == "tsp":
+                sorted_edge_pairs = traveling_salesman_edge_pairs(
+                    target_edge_pairs + edge_pairs,
+                    "edge pairs",
+                    self.tsp_optim_steps,
+                    self.tsp_time_budget,
+                    self.distance_cache,
+                )
+            else:
+                raise ValueError("invalid match_method {}".format(self.match_method))
+
             # logger.info(f"sorted_edge_pairs\n{pformat(sorted_edge_pairs)}")
 
             if sorted_edge_pairs[0][0].position is None:
@@ -936,7 +1182,9 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
                 permutations = "odd_cube_center_color_permutations"
                 self.assign_color_names(desc, sorted_center_squares, permutations, self.color_box)
             else:
-                sorted_center_squares = traveling_salesman(center_squares)
+                sorted_center_squares = traveling_salesman(
+                    center_squares, self.tsp_optim_steps, self.tsp_time_budget, self.distance_cache
+                )
                 permutations = "even_cube_center_color_permutations"
                 self.assign_color_names(desc, sorted_center_squares, permutations, self.color_box)
 
@@ -952,17 +1200,30 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
             self.write_html(html_init_cube)
             self.write_crayola_colors()
 
-        self.resolve_color_box()
+        # Share the square to square and square to reference color distances between
+        # the resolve stages, they are freed once the cube is resolved
+        self.distance_cache = DistanceCache(
+            self.squares_per_side * 6, use_numpy=numpy is not None, metric=get_metric(self.metric)
+        )
+        self.distance_cache.set_squares(self.pos2square.values())
+        self.distance_cache.add_colors(crayola_colors)
 
-        # corners
-        self.resolve_corner_squares()
+        if self.stage_timings is None:
+            self.resolve_color_box()
 
-        # centers
-        self.resolve_center_squares()
+            # corners
+            self.resolve_corner_squares()
 
-        # edges
-        self.resolve_edge_squares()
-        self.set_state()
+            # centers
+            self.resolve_center_squares()
+
+            # edges
+            self.resolve_edge_squares()
+            self.set_state()
+        else:
+            self.crunch_colors_timed()
+
+        self.distance_cache.release()
 
         if self.write_debug_file:
             html_final_cube = self.html_cube("Final Cube", True, "final_cube")
@@ -970,24 +1231,308 @@ class RubiksColorSolverGeneric(RubiksCube, WwwMixin):
 
             self.write_html(html)
             self.www_footer()
+            self.write_debug_html()
+
+    def crunch_colors_timed(self) -> None:
+        """
+        The resolve stages of crunch_colors(), each one timed in self.stage_timings
+        """
+        timings = self.stage_timings
+        timings.scans += 1
+        timings.call("resolve_color_box", self.resolve_color_box)
+        timings.call("resolve_corner_squares", self.resolve_corner_squares)
+        timings.call("resolve_center_squares", self.resolve_center_squares)
+        timings.call("resolve_edge_squares", self.resolve_edge_squares)
+        timings.call("set_state", self.set_state)
 
     def print_profile_data(self):
-        # print_profile_data()
-        pass
+        if self.stage_timings is not None:
+            print(self.stage_timings)
+
+
+def get_cube_width(scan_data: Dict[int, Tuple[int, int, int]]) -> int:
+    """
+    Return the width of the cube (3 for a 3x3x3, etc) that scan_data is for
+    """
+    square_count = len(scan_data)
+    square_count_per_side = int(square_count / 6)
+    return int(sqrt(square_count_per_side))
+
+
+def _resolve_scan(
+    cubes: Dict[int, RubiksColorSolverGeneric],
+    scan_data: Dict[int, Tuple[int, int, int]],
+    width: int = None,
+    use_json: bool = False,
+    validate: bool = True,
+    timings: StageTimings = None,
+    metric: str = "euclidean",
+) -> Union[str, Dict]:
+    """
+    Resolve a single scan using the RubiksColorSolverGeneric for its width from
+    cubes, creating it if this is the first scan of that width. scan_data may also
+    be a PackedCube, its colors are updated in place. The stages are timed in
+    timings if it is not None.
+    """
+    is_packed = isinstance(scan_data, PackedCube)
+
+    if is_packed:
+        width = scan_data.width
+    elif width is None:
+        width = get_cube_width(scan_data)
+
+    cube = cubes.get(width)
+
+    if cube is None:
+        cube = RubiksColorSolverGeneric(width)
+        cubes[width] = cube
+    else:
+        cube.reset()
+
+    cube.validate = validate
+    cube.stage_timings = timings
+    cube.metric = metric
+
+    # the debug page is only for resolving a single cube
+    cube.write_debug_file = False
+
+    if is_packed:
+        cube.resolve_packed(scan_data)
+    else:
+        cube.enter_scan_data(scan_data)
+        cube.crunch_colors()
+
+    if use_json:
+        return cube.cube_for_json()
+    else:
+        return "".join(cube.cube_for_kociemba_strict())
+
+
+# The RubiksColorSolverGeneric objects, one per width, used by this process when it
+# is a resolve_many() worker
+worker_cubes = {}
+
+
+def _resolve_many_worker_init(widths: Tuple[int]) -> None:
+    """
+    Runs once in each resolve_many() worker process. Import the lookup tables and
+    build the geometry for each width up front so the first scan does not pay for it.
+    """
+    # standard libraries
+    from importlib import import_module
+
+    import_module("rubikscolorresolver.permutations")
+
+    for width in widths:
+        import_module("rubikscolorresolver.cube_{}{}{}".format(width, width, width))
+        worker_cubes[width] = RubiksColorSolverGeneric(width)
+
+
+def _resolve_many_worker(
+    scan_data: Dict[int, Tuple[int, int, int]],
+    width: int,
+    use_json: bool,
+    validate: bool,
+    profile: bool = False,
+    metric: str = "euclidean",
+) -> Union[str, Dict, Tuple[Union[str, Dict], Dict]]:
+    """
+    If profile is True return a (result, StageTimings.as_dict()) tuple
+    """
+    if not profile:
+        return _resolve_scan(worker_cubes, scan_data, width, use_json, validate, metric=metric)
+
+    timings = StageTimings()
+    result = _resolve_scan(worker_cubes, scan_data, width, use_json, validate, timings, metric)
+    return (result, timings.as_dict())
+
+
+def resolve_iter(
+    scans: Iterable[Dict[int, Tuple[int, int, int]]],
+    width: int = None,
+    use_json: bool = False,
+    workers: int = 1,
+    chunksize: int = 32,
+    validate: bool = True,
+    timings: StageTimings = None,
+    metric: str = "euclidean",
+) -> Iterator[Union[str, Dict]]:
+    """
+    Generator version of resolve_many(), results are yielded in the same order as
+    scans as soon as they are available.
+    """
+    get_metric(metric)
+
+    if workers <= 1:
+        cubes = {}
+
+        for scan_data in scans:
+            yield _resolve_scan(cubes, scan_data, width, use_json, validate, timings, metric)
+
+    else:
+        # standard libraries
+        from concurrent.futures import ProcessPoolExecutor
+        from itertools import repeat
+
+        if width is None:
+            widths = SUPPORTED_WIDTHS
+        else:
+            widths = (width,)
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_resolve_many_worker_init, initargs=(widths,)
+        ) as executor:
+            for result in executor.map(
+                _resolve_many_worker,
+                scans,
+                repeat(width),
+                repeat(use_json),
+                repeat(validate),
+                repeat(timings is not None),
+                repeat(metric),
+                chunksize=chunksize,
+            ):
+                if timings is not None:
+                    (result, scan_timings) = result
+                    timings.merge(scan_timings)
+
+                yield result
+
+
+def resolve_many(
+    scans: Iterable[Dict[int, Tuple[int, int, int]]],
+    width: int = None,
+    use_json: bool = False,
+    workers: int = 1,
+    chunksize: int = 32,
+    validate: bool = True,
+    timings: StageTimings = None,
+    metric: str = "euclidean",
+) -> List[Union[str, Dict]]:
+    """
+    Resolve a batch of scans and return the results in the same order as scans.
+    Each result is a kociemba string, or the cube_for_json() dictionary if use_json
+    is True.
+
+    The sides, wing partners, etc are only built once per cube width and are then
+    reused for every scan of that width.  If width is None it is computed from the
+    number of squares in each scan, so scans of different widths can be mixed.
+
+    A scan may also be a PackedCube. Its color assignments are updated in place unless
+    workers is more than 1, in that case only the returned results are available.
+
+    If workers is more than 1 the scans are spread across a pool of that many
+    processes. Scans are sent to the workers in chunks of chunksize, larger chunks
+    mean less IPC overhead but a longer wait for the first result.
+
+    Each scan is checked by RubiksCube.validate_scan_data() unless validate is False,
+    skip it if the scans are known to be good.
+
+    If timings is a StageTimings the time spent in each stage of crunch_colors() is
+    added to it, for the whole batch. This also works when workers is more than 1.
+
+    metric is the name of the color distance metric to use, see METRICS. A ValueError
+    is raised if it is not one of them.
+    """
+    return list(resolve_iter(scans, width, use_json, workers, chunksize, validate, timings, metric))
+
+
+def resolve_batch(input_fh, output_fh, use_json: bool = False, metric: str = "euclidean", timings=None) -> int:
+    """
+    Read one JSON scan per line from input_fh and write one JSON result per line to
+    output_fh, in the same order. The result is {"kociemba": "..."}, or the
+    cube_for_json() dictionary if use_json is True. A scan that can not be resolved
+    gets {"line": N, "error": "..."} and the batch carries on. Blank lines are skipped.
+
+    Only one scan is held at a time and the RubiksColorSolverGeneric for each width
+    is reused, so the memory used does not grow with the number of scans. output_fh
+    is flushed after every result so this can sit in a pipeline.
+
+    Return the number of scans that could not be resolved.
+    """
+    try:
+        # standard libraries
+        from json import dumps as json_dumps
+    except ImportError:
+        # third party libraries
+        from ujson import dumps as json_dumps
+
+    cubes = {}
+    errors = 0
+    line_number = 0
+
+    for line in input_fh:
+        line_number += 1
+
+        if not line.strip():
+            continue
+
+        try:
+            packed = load_scan(line)
+            cube = cubes.get(packed.width)
+
+            if cube is None:
+                cube = RubiksColorSolverGeneric(packed.width)
+                cube.metric = metric
+
+                # load_scan() already validated the scan
+                cube.validate = False
+                cube.stage_timings = timings
+                cubes[packed.width] = cube
+            else:
+                cube.reset()
+
+            cube.resolve_packed(packed)
+
+            if use_json:
+                result = cube.cube_for_json()
+            else:
+                result = {"kociemba": "".join(cube.cube_for_kociemba_strict())}
+
+        except Exception as e:
+            errors += 1
+            result = {"line": line_number, "error": str(e)}
+
+        output_fh.write(json_dumps(result) + "\n")
+        output_fh.flush()
+
+    return errors
 
 
 def resolve_colors(argv):
-    help_string = """usage: rubiks-color-resolver.py [-h] [-j] [--filename FILENAME] [--rgb RGB]
+    help_string = """usage: rubiks-color-resolver.py [-h] [-j] [--filename FILENAME] [--rgb RGB] [--metric METRIC]
+                                    [--profile] [--debug-html FILENAME] [--batch]
+                                    [--serve] [--socket PATH] [--port PORT] [--workers N]
 
     optional arguments:
       -h, --help           show this help message and exit
       -j, --json           Print json results
       --filename FILENAME  Print json results
       --rgb RGB            RGB json
+      --batch              Read one JSON scan per line from --filename (stdin if
+                           there is no --filename) and print one JSON result per line
+      --serve              Run a resolver daemon, see rubikscolorresolver/server.py
+      --socket PATH        --serve on the unix socket PATH (the default is
+                           /tmp/rubiks-color-resolver.sock)
+      --port PORT          --serve on TCP port PORT on localhost
+      --workers N          The number of --serve worker processes (the default is
+                           the number of CPUs)
+      --metric METRIC      Color distance metric: euclidean (default), cie76, cie94, fixed, cie2000
+      --profile            Print the time spent in each stage
+      --debug-html FILENAME
+                           Write a debug page of the resolve steps to FILENAME
     """
     filename = None
     rgb = None
     use_json = False
+    metric = "euclidean"
+    profile = False
+    debug_filename = None
+    batch = False
+    serve = False
+    socket_path = None
+    port = None
+    workers = None
     argv_index = 1
 
     while argv_index < len(argv):
@@ -1004,6 +1549,38 @@ def resolve_colors(argv):
             rgb = argv[argv_index + 1]
             argv_index += 2
 
+        elif argv[argv_index] == "--debug-html":
+            debug_filename = argv[argv_index + 1]
+            argv_index += 2
+
+        elif argv[argv_index] == "--profile":
+            profile = True
+            argv_index += 1
+
+        elif argv[argv_index] == "--batch":
+            batch = True
+            argv_index += 1
+
+        elif argv[argv_index] == "--serve":
+            serve = True
+            argv_index += 1
+
+        elif argv[argv_index] == "--socket":
+            socket_path = argv[argv_index + 1]
+            argv_index += 2
+
+        elif argv[argv_index] == "--port":
+            port = int(argv[argv_index + 1])
+            argv_index += 2
+
+        elif argv[argv_index] == "--workers":
+            workers = int(argv[argv_index + 1])
+            argv_index += 2
+
+        elif argv[argv_index] == "--metric":
+            metric = argv[argv_index + 1]
+            argv_index += 2
+
         elif argv[argv_index] == "--json" or argv[argv_index] == "-j":
             use_json = True
             argv_index += 1
@@ -1012,9 +1589,40 @@ def resolve_colors(argv):
             print(help_string)
             sys.exit(1)
 
+    if metric not in METRICS:
+        print("ERROR: invalid --metric {}, choose from {}".format(metric, ", ".join(sorted(METRICS.keys()))))
+        sys.exit(1)
+
+    if serve:
+        # rubiks cube libraries
+        from rubikscolorresolver.server import serve
+
+        serve(socket_path, port, workers, metric)
+        return None
+
+    if batch:
+        if profile:
+            timings = StageTimings()
+        else:
+            timings = None
+
+        if filename:
+            with open(filename, "r") as fh:
+                errors = resolve_batch(fh, sys.stdout, use_json, metric, timings)
+        else:
+            errors = resolve_batch(sys.stdin, sys.stdout, use_json, metric, timings)
+
+        if timings is not None:
+            sys.stderr.write("{}\n".format(timings))
+
+        if errors:
+            sys.exit(1)
+
+        return None
+
     if filename:
         with open(filename, "r") as fh:
-            rgb = "".join(fh.readlines())
+            rgb = fh.read()
     elif rgb:
         pass
     else:
@@ -1022,19 +1630,27 @@ def resolve_colors(argv):
         sys.exit(1)
 
     argv = None
-    scan_data = eval(rgb)
 
-    for key, value in scan_data.items():
-        scan_data[key] = tuple(value)
+    try:
+        packed = load_scan(rgb)
+    except ValueError as e:
+        print("ERROR: {}".format(e))
+        sys.exit(1)
 
-    square_count = len(list(scan_data.keys()))
-    square_count_per_side = int(square_count / 6)
-    width = int(sqrt(square_count_per_side))
+    cube = RubiksColorSolverGeneric(packed.width)
+    cube.metric = metric
+
+    # load_scan() already validated the scan
+    cube.validate = False
+
+    if debug_filename:
+        cube.write_debug_file = True
+        cube.debug_filename = debug_filename
+
+    if profile:
+        cube.stage_timings = StageTimings()
 
-    cube = RubiksColorSolverGeneric(width)
-    cube.write_debug_file = True
-    cube.enter_scan_data(scan_data)
-    cube.crunch_colors()
+    cube.resolve_packed(packed)
     cube.print_profile_data()
     cube.print_cube()
 
@@ -1,8 +1,10 @@
 # rubiks cube libraries
-from rubikscolorresolver.color import rgb2lab
+from rubikscolorresolver.color import LabColor, rgb2lab
 
 
 class Square(object):
+    __slots__ = ("position", "lab", "side_name", "color_name", "via_color_box")
+
     def __init__(
         self,
         position: int,
@@ -12,22 +14,18 @@ class Square(object):
         side_name: None = None,
         color_name: None = None,
         via_color_box: bool = False,
+        lab: LabColor = None,
     ) -> None:
-        assert position is None or isinstance(position, int)
-        assert isinstance(red, int)
-        assert isinstance(green, int)
-        assert isinstance(blue, int)
-        assert side_name is None or isinstance(side_name, str)
-        assert color_name is None or isinstance(color_name, str)
-
-        if side_name is not None:
-            assert side_name in ("U", "L", "F", "R", "B", "D")
+        # The RGB values are validated once by RubiksCube.validate_scan_data(), this
+        # is called for every square (and every color_box square) so keep it lean.
+        self.position = position
 
-        if color_name is not None:
-            assert color_name in ("Wh", "Ye", "OR", "Rd", "Gr", "Bu")
+        # The caller may have already converted the RGB values to Lab
+        if lab is None:
+            self.lab = rgb2lab((red, green, blue))
+        else:
+            self.lab = lab
 
-        self.position = position
-        self.lab = rgb2lab((red, green, blue))
         self.side_name = side_name  # ULFRBD
         self.color_name = color_name
         self.via_color_box = via_color_box
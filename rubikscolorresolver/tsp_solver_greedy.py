@@ -6,6 +6,14 @@ https://github.com/dmishin/tsp-solver/blob/master/tsp_solver/greedy.py
 # standard libraries
 from array import array as pyarray
 
+try:
+    # standard libraries
+    from time import perf_counter
+except ImportError:
+    # micropython
+    # standard libraries
+    from time import time as perf_counter
+
 try:
     # standard libraries
     from typing import List, Tuple
@@ -14,17 +22,31 @@ except ImportError:
     pass
 
 
-def optimize_solution(distances, connections, endpoints) -> Tuple:
+def reverse_path(path, i: int, j: int) -> None:
     """
-    Tries to optimize solution, found by the greedy algorithm
+    Reverse path[i..j] (inclusive) in place
     """
-    N = len(connections)
-    path = restore_path(connections, endpoints)
+    while i < j:
+        (path[i], path[j]) = (path[j], path[i])
+        i += 1
+        j -= 1
+
+
+def optimize_solution(distances, path, deadline: float = None) -> Tuple:
+    """
+    Tries to optimize solution, found by the greedy algorithm
 
-    def ds(i, j):  # distance between ith and jth points of path
-        pi = path[i]
-        pj = path[j]
+    path is an array of vertex indices that is modified in place, the first and last
+    vertex are never moved. This makes one pass of 2-opt moves (reverse a section of
+    the path) followed by one pass of Or-opt moves (move a section of 1 to 3 vertices
+    elsewhere in the path, possibly reversed). If deadline (a perf_counter() value) is
+    reached the pass stops early.
 
+    Returns a (number of optimizations, total distance saved) tuple.
+    """
+    N = len(path)
+
+    def dist(pi, pj):  # distance between vertices pi and pj
         if pi < pj:
             return distances[pj][pi]
         else:
@@ -33,26 +55,72 @@ def optimize_solution(distances, connections, endpoints) -> Tuple:
     d_total = 0.0
     optimizations = 0
 
+    # 2-opt, replace the edges a-b and c-d with a-c and b-d by reversing b..c
     for a in range(N - 1):
+        if deadline is not None and perf_counter() > deadline:
+            return (optimizations, d_total)
+
         b = a + 1
 
         for c in range(b + 2, N - 1):
             d = c + 1
-            delta_d = ds(a, b) + ds(c, d) - (ds(a, c) + ds(b, d))
+            delta_d = (
+                dist(path[a], path[b]) + dist(path[c], path[d]) - (dist(path[a], path[c]) + dist(path[b], path[d]))
+            )
 
             if delta_d > 0:
                 d_total += delta_d
                 optimizations += 1
-                connections[path[a]].remove(path[b])
-                connections[path[a]].append(path[c])
-                connections[path[b]].remove(path[a])
-                connections[path[b]].append(path[d])
+                reverse_path(path, b, c)
+
+    # Or-opt, move the section path[i..i+k-1] between path[j] and path[j+1]
+    for k in (1, 2, 3):
+        for i in range(1, N - k):
+            if deadline is not None and perf_counter() > deadline:
+                return (optimizations, d_total)
+
+            last = i + k - 1
+            (prev_node, first_node, last_node, next_node) = (path[i - 1], path[i], path[last], path[last + 1])
+            removed = dist(prev_node, first_node) + dist(last_node, next_node) - dist(prev_node, next_node)
+
+            if removed <= 0:
+                continue
+
+            for j in range(N - 1):
+                if j >= i - 1 and j <= last:
+                    continue
+
+                (node_j, node_j1) = (path[j], path[j + 1])
+                edge = dist(node_j, node_j1)
+                delta_d = removed - (dist(node_j, first_node) + dist(last_node, node_j1) - edge)
+                reverse = False
+
+                if k > 1:
+                    reversed_delta_d = removed - (dist(node_j, last_node) + dist(first_node, node_j1) - edge)
 
-                connections[path[c]].remove(path[d])
-                connections[path[c]].append(path[a])
-                connections[path[d]].remove(path[c])
-                connections[path[d]].append(path[b])
-                path[:] = restore_path(connections, endpoints)
+                    if reversed_delta_d > delta_d:
+                        delta_d = reversed_delta_d
+                        reverse = True
+
+                if delta_d > 0:
+                    d_total += delta_d
+                    optimizations += 1
+
+                    # Swap the section with the vertices between it and j via reversals
+                    if j > last:
+                        if not reverse:
+                            reverse_path(path, i, last)
+
+                        reverse_path(path, last + 1, j)
+                        reverse_path(path, i, j)
+                    else:
+                        reverse_path(path, j + 1, i - 1)
+
+                        if not reverse:
+                            reverse_path(path, i, last)
+
+                        reverse_path(path, j + 1, last)
+                    break
 
     return (optimizations, d_total)
 
@@ -89,18 +157,34 @@ def restore_path(connections: List[List[int]], endpoints: Tuple[int, int]) -> Li
 
 def pairs_by_dist(N: int, distances) -> Tuple[Tuple[int, int]]:
     """
-    returns list of coordinate pairs (i,j), sorted by distances; such that i < j
-    """
+    returns a generator of coordinate pairs (i,j), sorted by distances; such that i > j
 
-    # sort coordinate pairs by distance
+    The distances are copied into one flat list so the pairs, as flat indices
+    i * N + j, can be sorted with the list's own __getitem__ as the key instead of
+    a lambda that indexes distances twice per pair. join_segments() usually stops
+    well before the last pair so the (i,j) tuples are only built as they are consumed.
+    """
+    flat = []
     indices = []
 
-    for i in range(N):
-        for j in range(i):
-            indices.append(i * N + j)
+    for (i, row) in enumerate(distances):
+        flat.extend(row)
+
+        # pad the rows of a left-triangular matrix so each row starts at i * N
+        if len(row) < N:
+            flat.extend([0] * (N - len(row)))
+
+        indices.extend(range(i * N, i * N + i))
 
-    indices.sort(key=lambda ij: distances[ij // N][ij % N])
-    return ((ij // N, ij % N) for ij in indices)
+    try:
+        key = flat.__getitem__
+    except AttributeError:
+        # micropython does not expose __getitem__ on builtin types
+        def key(ij):
+            return flat[ij]
+
+    indices.sort(key=key)
+    return (divmod(ij, N) for ij in indices)
 
 
 def calc_path_cost(distances, path) -> float:
@@ -134,16 +218,18 @@ def calc_path_cost(distances, path) -> float:
     return cost
 
 
-def solve_tsp(distances, optim_steps: int = 0, endpoints: Tuple[int, int] = None) -> List[int]:
+def solve_tsp(
+    distances, optim_steps: int = 0, endpoints: Tuple[int, int] = None, time_budget: float = None
+) -> List[int]:
     """
     Given a distance matrix, finds a solution for the TSP problem.
     Returns list of vertex indices.
     Guarantees that the first index is lower than the last
 
     :arg: distances : left-triangular matrix of distances. array of arrays
-    :arg: optim_steps (int) number of additional optimization steps, allows to improve solution but costly.
-    :arg: pairs_by_dist (function) an implementtion of the pairs_by_dist function. for optimization purposes.
+    :arg: optim_steps (int) max number of 2-opt/Or-opt passes over the greedy solution, allows to improve it but costly.
     :arg: endpoinds : None or pair (int,int)
+    :arg: time_budget (float) None or the max number of seconds to spend on the optim_steps passes
     """
     N = len(distances)
 
@@ -172,8 +258,18 @@ def solve_tsp(distances, optim_steps: int = 0, endpoints: Tuple[int, int] = None
     connections = [[] for i in range(N)]
 
     def join_segments(sorted_pairs):
-        # segments of nodes. Initially, each segment contains only 1 node
-        segments = [[i] for i in range(N)]
+        # Segments of nodes are tracked with a union-find. Initially each node is
+        # its own segment, parent[i] == i for the root node of each segment.
+        parent = pyarray("i", range(N))
+        rank = bytearray(N)
+
+        def find(i):
+            # path halving, point each node we pass at its grandparent
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+
+            return i
 
         def possible_edges():
             # Generate sequence of graph edges, that are possible and connect different segments.
@@ -181,7 +277,7 @@ def solve_tsp(distances, optim_steps: int = 0, endpoints: Tuple[int, int] = None
                 (i, j) = ij
 
                 # if both start and end could have connections and both nodes connect to a different segments
-                if node_valency[i] and node_valency[j] and (segments[i] is not segments[j]):
+                if node_valency[i] and node_valency[j] and find(i) != find(j):
                     yield ij
 
         def connect_vertices(i, j):
@@ -190,24 +286,23 @@ def solve_tsp(distances, optim_steps: int = 0, endpoints: Tuple[int, int] = None
             connections[i].append(j)
             connections[j].append(i)
 
-            # Merge segment J into segment I.
-            seg_i = segments[i]
-            seg_j = segments[j]
+            # Merge the segments, union by rank
+            root_i = find(i)
+            root_j = find(j)
 
-            if len(seg_j) > len(seg_i):
-                (seg_i, seg_j) = (seg_j, seg_i)
-                (i, j) = (j, i)
+            if rank[root_i] < rank[root_j]:
+                (root_i, root_j) = (root_j, root_i)
 
-            for node_idx in seg_j:
-                segments[node_idx] = seg_i
+            parent[root_j] = root_i
 
-            seg_i.extend(seg_j)
+            if rank[root_i] == rank[root_j]:
+                rank[root_i] += 1
 
         def edge_connects_endpoint_segments(i, j):
             # return True, if given ede merges 2 segments that have endpoints in them
-            (si, sj) = (segments[i], segments[j])
-            (ss, se) = (segments[start], segments[end])
-            return (si is ss) and (sj is se) or (sj is ss) and (si is se)
+            (si, sj) = (find(i), find(j))
+            (ss, se) = (find(start), find(end))
+            return (si == ss) and (sj == se) or (sj == ss) and (si == se)
 
         # Take first N-1 possible edge. they are already sorted by distance
         edges_left = N - 1
@@ -225,12 +320,20 @@ def solve_tsp(distances, optim_steps: int = 0, endpoints: Tuple[int, int] = None
     # invoke main greedy algorithm
     join_segments(pairs_by_dist(N, distances))
 
+    # restore path from the connections map (graph)
+    path = restore_path(connections, endpoints=endpoints)
+
     # now call additional optiomization procedure.
-    for passn in range(optim_steps):
-        (nopt, dtotal) = optimize_solution(distances, connections, endpoints)
+    if optim_steps:
+        path = pyarray("i", path)
+        deadline = None if time_budget is None else perf_counter() + time_budget
 
-        if nopt == 0:
-            break
+        for passn in range(optim_steps):
+            (nopt, dtotal) = optimize_solution(distances, path, deadline)
 
-    # restore path from the connections map (graph) and return it
-    return restore_path(connections, endpoints=endpoints)
+            if nopt == 0 or (deadline is not None and perf_counter() > deadline):
+                break
+
+        path = list(path)
+
+    return path
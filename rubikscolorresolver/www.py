@@ -1,6 +1,5 @@
 # standard libraries
 import logging
-import os
 import sys
 
 # rubiks cube libraries
@@ -10,16 +9,12 @@ logger = logging.getLogger(__name__)
 
 ALL_COLORS = ("Bu", "Gr", "OR", "Rd", "Wh", "Ye")
 
+# The default RubiksCube.debug_filename
 if sys.implementation.name == "micropython":
     HTML_FILENAME = "rubiks-color-resolver.html"
 else:
     HTML_FILENAME = "/tmp/rubiks-color-resolver.html"
 
-try:
-    os.unlink(HTML_FILENAME)
-except Exception:
-    pass
-
 
 def get_important_square_indexes(size):
     squares_per_side = size * size
@@ -57,25 +52,25 @@ crayola_colors = {
 }
 
 
-def open_mode(filename):
-    if os.path.exists(HTML_FILENAME):
-        return "a"
-    else:
-        return "w"
-
-
 class WwwMixin:
+    """
+    The debug page written when write_debug_file is True. The page is rendered into
+    html_buffer as the cube is resolved and written to debug_filename by
+    write_debug_html() at the end.
+    """
+
     def www_header(self):
         """
-        Write the <head> including css
+        Start a new page with the <head> including css
         """
+        self.html_buffer = []
         side_margin = 10
         square_size = 40
         size = self.width  # 3 for 3x3x3, etc
 
-        with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-            fh.write(
-                """<!DOCTYPE html>
+        write = self.html_buffer.append
+        write(
+            """<!DOCTYPE html>
 <html>
 <head>
 <meta charset="UTF-8">
@@ -94,14 +89,14 @@ div.side {
 }
 
 """
-                % side_margin
-            )
+            % side_margin
+        )
 
-            for x in range(1, size - 1):
-                fh.write("div.col%d,\n" % x)
+        for x in range(1, size - 1):
+            write("div.col%d,\n" % x)
 
-            fh.write(
-                """div.col%d {
+        write(
+            """div.col%d {
     float: left;
 }
 
@@ -113,16 +108,16 @@ div#down {
     margin-left: %dpx;
 }
 """
-                % (
-                    size - 1,
-                    size,
-                    (size - 1) * square_size,
-                    (size * square_size) + (3 * side_margin),
-                )
+            % (
+                size - 1,
+                size,
+                (size - 1) * square_size,
+                (size * square_size) + (3 * side_margin),
             )
+        )
 
-            fh.write(
-                """
+        write(
+            """
 span.half_square {
     width: %dpx;
     height: %dpx;
@@ -195,126 +190,98 @@ $(document).ready(function()
 </head>
 <body>
 """
-                % (
-                    int(square_size / 2),
-                    square_size,
-                    square_size,
-                    square_size,
-                    square_size,
-                    square_size,
-                    square_size,
-                    square_size,
-                    square_size,
-                )
+            % (
+                int(square_size / 2),
+                square_size,
+                square_size,
+                square_size,
+                square_size,
+                square_size,
+                square_size,
+                square_size,
+                square_size,
             )
+        )
 
     def write_color_corners(self, desc, corners):
-        with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-            fh.write("<div class='clear colors'>\n")
-            fh.write("<h2>%s</h2>\n" % desc)
-
-            for row_index in range(3):
-                for (index, (corner0, corner1, corner2)) in enumerate(corners):
-
-                    if row_index == 0:
-                        square = corner0
-                    elif row_index == 1:
-                        square = corner1
-                    elif row_index == 2:
-                        square = corner2
-                    else:
-                        raise ValueError(row_index)
-
-                    (red, green, blue) = (
-                        square.lab.red,
-                        square.lab.green,
-                        square.lab.blue,
-                    )
+        write = self.html_buffer.append
+        write("<div class='clear colors'>\n")
+        write("<h2>%s</h2>\n" % desc)
+
+        for row_index in range(3):
+            for (index, (corner0, corner1, corner2)) in enumerate(corners):
+
+                if row_index == 0:
+                    square = corner0
+                elif row_index == 1:
+                    square = corner1
+                elif row_index == 2:
+                    square = corner2
+                else:
+                    raise ValueError(row_index)
+
+                (red, green, blue) = (
+                    square.lab.red,
+                    square.lab.green,
+                    square.lab.blue,
+                )
 
-                    if index and index % 2 == 0:
-                        fh.write("<span class='half_square'></span>")
-
-                    if square.position:
-                        desc = square.position
-                    else:
-                        desc = square.color_name
-
-                    fh.write(
-                        "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%s</span>\n"  # noqa: E501
-                        % (
-                            red,
-                            green,
-                            blue,
-                            red,
-                            green,
-                            blue,
-                            int(square.lab.L),
-                            int(square.lab.a),
-                            int(square.lab.b),
-                            square.color_name,
-                            desc,
-                        )
+                if index and index % 2 == 0:
+                    write("<span class='half_square'></span>")
+
+                if square.position:
+                    desc = square.position
+                else:
+                    desc = square.color_name
+
+                write(
+                    "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%s</span>\n"  # noqa: E501
+                    % (
+                        red,
+                        green,
+                        blue,
+                        red,
+                        green,
+                        blue,
+                        int(square.lab.L),
+                        int(square.lab.a),
+                        int(square.lab.b),
+                        square.color_name,
+                        desc,
                     )
-                fh.write("<br>")
-            fh.write("</div>\n")
+                )
+            write("<br>")
+        write("</div>\n")
 
     def write_color_edge_pairs(self, desc, square_pairs):
-        with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-            fh.write("<div class='clear colors'>\n")
-            fh.write("<h2>%s</h2>\n" % desc)
-
-            for use_square1 in (True, False):
-                for (index, (square1, square2)) in enumerate(square_pairs):
-
-                    if use_square1:
-                        square = square1
-                    else:
-                        square = square2
-
-                    (red, green, blue) = (
-                        square.lab.red,
-                        square.lab.green,
-                        square.lab.blue,
-                    )
+        write = self.html_buffer.append
+        write("<div class='clear colors'>\n")
+        write("<h2>%s</h2>\n" % desc)
 
-                    if index and index % 2 == 0:
-                        fh.write("<span class='half_square'></span>")
-
-                    if square.position:
-                        desc = square.position
-                    else:
-                        desc = square.color_name
-
-                    fh.write(
-                        "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%s</span>\n"  # noqa: E501
-                        % (
-                            red,
-                            green,
-                            blue,
-                            red,
-                            green,
-                            blue,
-                            int(square.lab.L),
-                            int(square.lab.a),
-                            int(square.lab.b),
-                            square.color_name,
-                            desc,
-                        )
-                    )
-                fh.write("<br>")
-            fh.write("</div>\n")
+        for use_square1 in (True, False):
+            for (index, (square1, square2)) in enumerate(square_pairs):
 
-    def write_colors(self, desc, squares):
-        with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-            squares_per_row = int(len(squares) / 6)
-            fh.write("<div class='clear colors'>\n")
-            fh.write("<h2>%s</h2>\n" % desc)
-
-            count = 0
-            for square in squares:
-                (red, green, blue) = (square.lab.red, square.lab.green, square.lab.blue)
-                fh.write(
-                    "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%d</span>\n"  # noqa: E501
+                if use_square1:
+                    square = square1
+                else:
+                    square = square2
+
+                (red, green, blue) = (
+                    square.lab.red,
+                    square.lab.green,
+                    square.lab.blue,
+                )
+
+                if index and index % 2 == 0:
+                    write("<span class='half_square'></span>")
+
+                if square.position:
+                    desc = square.position
+                else:
+                    desc = square.color_name
+
+                write(
+                    "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%s</span>\n"  # noqa: E501
                     % (
                         red,
                         green,
@@ -326,24 +293,51 @@ $(document).ready(function()
                         int(square.lab.a),
                         int(square.lab.b),
                         square.color_name,
-                        square.position,
+                        desc,
                     )
                 )
+            write("<br>")
+        write("</div>\n")
 
-                count += 1
+    def write_colors(self, desc, squares):
+        write = self.html_buffer.append
+        squares_per_row = int(len(squares) / 6)
+        write("<div class='clear colors'>\n")
+        write("<h2>%s</h2>\n" % desc)
+
+        count = 0
+        for square in squares:
+            (red, green, blue) = (square.lab.red, square.lab.green, square.lab.blue)
+            write(
+                "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%d</span>\n"  # noqa: E501
+                % (
+                    red,
+                    green,
+                    blue,
+                    red,
+                    green,
+                    blue,
+                    int(square.lab.L),
+                    int(square.lab.a),
+                    int(square.lab.b),
+                    square.color_name,
+                    square.position,
+                )
+            )
 
-                if count % squares_per_row == 0:
-                    fh.write("<br>")
-            fh.write("</div>\n")
+            count += 1
+
+            if count % squares_per_row == 0:
+                write("<br>")
+        write("</div>\n")
 
     def www_footer(self):
-        with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-            fh.write(
-                """
+        self.html_buffer.append(
+            """
 </body>
 </html>
 """
-            )
+        )
 
     def html_cube(self, desc, use_html_colors, div_class):
         cube = ["dummy"]
@@ -415,33 +409,42 @@ $(document).ready(function()
         return "".join(html)
 
     def write_html(self, html):
-        with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-            fh.write(html)
+        self.html_buffer.append(html)
+
+    def write_debug_html(self):
+        """
+        Write the page that was rendered into html_buffer to debug_filename, the whole
+        page is written at once
+        """
+        with open(self.debug_filename, "w") as fh:
+            fh.write("".join(self.html_buffer))
+
+        self.html_buffer = []
 
     def _write_colors(self, desc, box):
-        with open(HTML_FILENAME, open_mode(HTML_FILENAME)) as fh:
-            fh.write("<div class='clear colors'>\n")
-            fh.write("<h2>{}</h2>\n".format(desc))
+        write = self.html_buffer.append
+        write("<div class='clear colors'>\n")
+        write("<h2>{}</h2>\n".format(desc))
 
-            for color_name, lab in box.items():
-                fh.write(
-                    "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%s</span>\n"  # noqa: E501
-                    % (
-                        lab.red,
-                        lab.green,
-                        lab.blue,
-                        lab.red,
-                        lab.green,
-                        lab.blue,
-                        int(lab.L),
-                        int(lab.a),
-                        int(lab.b),
-                        color_name,
-                        color_name,
-                    )
+        for color_name, lab in box.items():
+            write(
+                "<span class='square' style='background-color:#%02x%02x%02x' title='RGB (%s, %s, %s), Lab (%s, %s, %s), color %s'>%s</span>\n"  # noqa: E501
+                % (
+                    lab.red,
+                    lab.green,
+                    lab.blue,
+                    lab.red,
+                    lab.green,
+                    lab.blue,
+                    int(lab.L),
+                    int(lab.a),
+                    int(lab.b),
+                    color_name,
+                    color_name,
                 )
-            fh.write("<br>")
-            fh.write("</div>\n")
+            )
+        write("<br>")
+        write("</div>\n")
 
     def write_crayola_colors(self):
         self._write_colors("crayola box", crayola_colors)
@@ -1,10 +1,58 @@
 # standard libraries
+import io
+import itertools
 import logging
+import os
 import unittest
+from math import sqrt
+
+try:
+    # standard libraries
+    from json import dumps as json_dumps
+    from json import load as json_load
+    from json import loads as json_loads
+except ImportError:
+    from ujson import dumps as json_dumps
+    from ujson import load as json_load
+    from ujson import loads as json_loads
 
 # rubiks cube libraries
-from rubikscolorresolver.color import hex_to_rgb, rgb2lab
-from rubikscolorresolver.solver import median
+from rubikscolorresolver import color, solver
+from rubikscolorresolver.assignment import best_swap_improvement, hungarian, min_cost_permutation
+from rubikscolorresolver.cache import ClockCache
+from rubikscolorresolver.color import (
+    hex_to_rgb,
+    integer_sqrt,
+    lab_distance,
+    lab_distance_cie2000,
+    lab_distance_fixed,
+    lab_distance_matrix,
+    rgb2lab,
+    rgb_list_to_lab,
+)
+from rubikscolorresolver.distance import DistanceCache
+from rubikscolorresolver.metric import METRICS, Metric, get_metric
+from rubikscolorresolver.packed import PackedCube, load_scan
+from rubikscolorresolver.profile import StageTimings
+from rubikscolorresolver.solver import RubiksColorSolverGeneric, get_cube_width, median, resolve_batch, resolve_many
+from rubikscolorresolver.tsp_solver_greedy import pairs_by_dist, solve_tsp
+
+
+def load_scan_data(filename):
+    with open("tests/test-data/" + filename, "r") as fh:
+        scan_data = {}
+
+        for (key, value) in json_load(fh).items():
+            scan_data[int(key)] = tuple(value)
+
+    return scan_data
+
+
+def resolve_scan_data(scan_data):
+    cube = RubiksColorSolverGeneric(get_cube_width(scan_data))
+    cube.enter_scan_data(scan_data)
+    cube.crunch_colors()
+    return cube
 
 
 class TestHex2RGB(unittest.TestCase):
@@ -67,6 +115,193 @@ class TestRGB2Lab(unittest.TestCase):
         self.assertAlmostEqual(lab.a, -2.1385958505868996, places=15)
         self.assertEqual(lab.b, -10.57740141476744)
 
+    def test_out_of_range(self):
+        for rgb in ((-1, 0, 0), (0, 256, 0), (0, 0, 1024)):
+            self.assertRaises(ValueError, rgb2lab, rgb)
+            self.assertRaises(ValueError, rgb_list_to_lab, [(0, 0, 0), rgb])
+
+
+class TestRGB2LabCache(unittest.TestCase):
+    def test_srgb_to_linear(self):
+        self.assertEqual(len(color.srgb_to_linear), 256)
+        self.assertEqual(color.srgb_to_linear[0], 0.0)
+        self.assertEqual(color.srgb_to_linear[255], 100.0)
+        self.assertEqual(color.srgb_to_linear[10], (10 / 255 / 12.92) * 100)
+
+    def test_cache_hit(self):
+        self.assertIs(rgb2lab((12, 34, 56)), rgb2lab((12, 34, 56)))
+
+    def test_cache_size(self):
+        for red in range(256):
+            for green in range(32):
+                rgb2lab((red, green, 7))
+
+        self.assertLessEqual(len(color.rgb2lab_cache), color.RGB2LAB_CACHE_SIZE)
+
+
+class TestClockCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = ClockCache(4)
+        self.assertEqual(cache.get("a"), None)
+        cache.put("a", 1)
+        cache.put("a", 2)
+        self.assertEqual(cache.get("a"), 2)
+        self.assertEqual(len(cache), 1)
+        self.assertRaises(ValueError, ClockCache, 0)
+
+    def test_eviction(self):
+        cache = ClockCache(4)
+
+        for key in range(4):
+            cache.put(key, key)
+
+        # 0 and 2 were used since they were added so 1 and 3 are evicted first
+        cache.get(0)
+        cache.get(2)
+        cache.put(4, 4)
+        cache.put(5, 5)
+        self.assertEqual(sorted(cache.slots.keys()), [0, 2, 4, 5])
+
+        for key in range(100):
+            cache.put(key, key)
+
+        self.assertEqual(len(cache), 4)
+        self.assertGreaterEqual(cache.stats()["evictions"], 96)
+
+    def test_stats(self):
+        cache = ClockCache(2)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.resize(8)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "evictions": 0, "size": 0, "max_size": 8})
+
+    def test_threads(self):
+        try:
+            # standard libraries
+            from threading import Thread
+        except ImportError:
+            # micropython
+            return
+
+        cache = ClockCache(8)
+        wrong = []
+
+        def worker(offset):
+            for x in range(5000):
+                key = (x * 7 + offset) % 20
+                value = cache.get(key)
+
+                if value is None:
+                    cache.put(key, key * 10)
+                elif value != key * 10:
+                    wrong.append((key, value))
+
+        threads = [Thread(target=worker, args=(offset,)) for offset in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(wrong, [])
+        self.assertEqual(sorted(cache.slots.values()), list(range(8)))
+
+    def test_cie2000(self):
+        cie2000_cache = color.cie2000_cache
+
+        try:
+            color.cie2000_cache = ClockCache(16)
+            lab1 = rgb2lab((200, 10, 30))
+            lab2 = rgb2lab((20, 90, 210))
+            delta_e = lab_distance_cie2000(lab1, lab2)
+
+            # both orders are served by the same entry
+            self.assertEqual(lab_distance_cie2000(lab2, lab1), delta_e)
+            self.assertEqual(len(color.cie2000_cache), 1)
+            self.assertEqual(color.cie2000_cache.stats()["hits"], 1)
+
+            for red in range(64):
+                lab_distance_cie2000(rgb2lab((red, 0, 0)), lab1)
+
+            self.assertEqual(len(color.cie2000_cache), 16)
+        finally:
+            color.cie2000_cache = cie2000_cache
+
+
+class TestMetric(unittest.TestCase):
+    def setUp(self):
+        self.labs = [
+            rgb2lab((red, green, blue)) for red in (0, 90, 255) for green in (10, 200) for blue in (0, 128, 250)
+        ]
+
+    def test_distance(self):
+        for lab1 in self.labs:
+            for lab2 in self.labs:
+                self.assertEqual(METRICS["euclidean"].distance(lab1, lab2), lab_distance(lab1, lab2))
+                self.assertEqual(METRICS["cie76"].distance(lab1, lab2), lab_distance(lab1, lab2))
+                self.assertEqual(METRICS["cie2000"].distance(lab1, lab2), int(lab_distance_cie2000(lab1, lab2)))
+
+                for distance_metric in METRICS.values():
+                    distance = distance_metric.distance(lab1, lab2)
+                    self.assertIsInstance(distance, int)
+                    self.assertEqual(distance, distance_metric.distance(lab2, lab1))
+
+    def test_fixed(self):
+        for n in list(range(1000)) + [4095, 4096, 4097, 123456789]:
+            self.assertEqual(integer_sqrt(n), int(sqrt(n)))
+
+        for lab1 in self.labs:
+            for lab2 in self.labs:
+                self.assertLessEqual(abs(lab_distance_fixed(lab1, lab2) - lab_distance(lab1, lab2)), 1)
+
+    def test_distance_matrix(self):
+        if color.numpy is None:
+            return
+
+        for distance_metric in METRICS.values():
+            expected = [[distance_metric.distance(lab1, lab2) for lab2 in self.labs] for lab1 in self.labs[:5]]
+            matrix = distance_metric.numpy_distance_matrix(self.labs[:5], self.labs)
+
+            for (row, expected_row) in zip(matrix.tolist(), expected):
+                for (distance, expected_distance) in zip(row, expected_row):
+                    self.assertLessEqual(abs(distance - expected_distance), 1)
+
+    def test_get_metric(self):
+        self.assertEqual(get_metric("cie94").name, "cie94")
+        self.assertRaises(ValueError, get_metric, "cie1976")
+
+    def test_crunch_colors(self):
+        scan_data = load_scan_data("3x3x3-random-01.txt")
+        expected = resolve_scan_data(scan_data).cube_for_kociemba_strict()
+
+        for name in METRICS.keys():
+            cube = RubiksColorSolverGeneric(3)
+            cube.metric = name
+            cube.enter_scan_data(scan_data)
+            cube.crunch_colors()
+            self.assertEqual(cube.cube_for_kociemba_strict(), expected)
+            self.assertEqual(cube.distance_cache.metric.name, name)
+
+        cube.metric = "cie1976"
+        self.assertRaises(ValueError, cube.crunch_colors)
+
+
+class TestRGBListToLab(unittest.TestCase):
+    def test_matches_rgb2lab(self):
+        rgb_list = [(255, 255, 255), (0, 0, 0), (255, 0, 0), (0, 255, 0), (0, 0, 255), (112, 128, 144), (5, 10, 3)]
+
+        for (rgb, lab) in zip(rgb_list, rgb_list_to_lab(rgb_list)):
+            expected = rgb2lab(rgb)
+            self.assertAlmostEqual(lab.L, expected.L, places=10)
+            self.assertAlmostEqual(lab.a, expected.a, places=10)
+            self.assertAlmostEqual(lab.b, expected.b, places=10)
+            self.assertEqual((lab.red, lab.green, lab.blue), rgb)
+
+    def test_empty(self):
+        self.assertEqual(rgb_list_to_lab([]), [])
+
 
 """
     from rubikscolorresolver.color import get_lab_distance
@@ -150,6 +385,843 @@ class TestMedian(unittest.TestCase):
         self.assertEqual(m, 8.5)
 
 
+class TestMinCostPermutation(unittest.TestCase):
+    def brute_force(self, costs):
+        min_cost = None
+        min_permutation = None
+
+        for permutation in itertools.permutations(range(6)):
+            cost = sum([costs[row][col] for (row, col) in enumerate(permutation)])
+
+            if min_cost is None or cost < min_cost:
+                min_cost = cost
+                min_permutation = tuple(permutation)
+
+        return min_permutation
+
+    def test_identity(self):
+        costs = [[0 if row == col else 10 for col in range(6)] for row in range(6)]
+        self.assertEqual(min_cost_permutation(costs), (0, 1, 2, 3, 4, 5))
+
+    def test_reversed(self):
+        costs = [[0 if row + col == 5 else 10 for col in range(6)] for row in range(6)]
+        self.assertEqual(min_cost_permutation(costs), (5, 4, 3, 2, 1, 0))
+
+    def test_all_ties(self):
+        costs = [[7] * 6 for row in range(6)]
+        self.assertEqual(min_cost_permutation(costs), (0, 1, 2, 3, 4, 5))
+
+    def test_matches_brute_force(self):
+        # A small linear congruential generator, so this also runs on micropython.
+        # The small range of costs produces a lot of ties.
+        seed = 1234
+
+        for _ in range(200):
+            costs = []
+
+            for row in range(6):
+                costs.append([])
+
+                for col in range(6):
+                    seed = (seed * 1103515245 + 12345) % 2147483648
+                    costs[row].append(seed % 8)
+
+            self.assertEqual(min_cost_permutation(costs), self.brute_force(costs))
+
+    def test_sizes(self):
+        self.assertEqual(min_cost_permutation([]), ())
+        self.assertEqual(min_cost_permutation([[3]]), (0,))
+        self.assertEqual(min_cost_permutation([[5, 1], [1, 5]]), (1, 0))
+
+
+class TestHungarian(unittest.TestCase):
+    def cost(self, costs, assignment):
+        return sum([costs[row][col] for (row, col) in enumerate(assignment)])
+
+    def test_matches_min_cost_permutation(self):
+        seed = 4321
+
+        for _ in range(200):
+            costs = []
+
+            for row in range(6):
+                costs.append([])
+
+                for col in range(6):
+                    seed = (seed * 1103515245 + 12345) % 2147483648
+                    costs[row].append(seed % 50)
+
+            assignment = hungarian(costs)
+            self.assertEqual(sorted(assignment), list(range(6)))
+            self.assertEqual(self.cost(costs, assignment), self.cost(costs, min_cost_permutation(costs)))
+
+    def test_rectangular(self):
+        costs = [[9, 2, 7, 1], [6, 4, 3, 8], [5, 8, 1, 8]]
+        self.assertEqual(hungarian(costs), (3, 1, 2))
+        self.assertRaises(ValueError, hungarian, [[1], [2]])
+
+    def test_sizes(self):
+        self.assertEqual(hungarian([]), ())
+        self.assertEqual(hungarian([[3]]), (0,))
+        self.assertEqual(hungarian([[5, 1], [1, 5]]), (1, 0))
+
+    def test_match_method(self):
+        for filename in ("3x3x3-random-01.txt", "4x4x4-random-01.txt", "5x5x5-random-01.txt"):
+            scan_data = load_scan_data(filename)
+            cube = RubiksColorSolverGeneric(get_cube_width(scan_data))
+            cube.match_method = "hungarian"
+            cube.enter_scan_data(scan_data)
+            cube.crunch_colors()
+            self.assertEqual(cube.cube_for_kociemba_strict(), resolve_scan_data(scan_data).cube_for_kociemba_strict())
+
+
+class TestBestSwapImprovement(unittest.TestCase):
+    def swap_passes(self, costs):
+        # The full pass over every pair that best_swap_improvement() replaces
+        perm = list(range(len(costs)))
+
+        while True:
+            max_delta = 0
+            max_delta_swap = None
+
+            for x in range(len(perm)):
+                for y in range(x + 1, len(perm)):
+                    delta = costs[x][perm[x]] + costs[y][perm[y]] - costs[x][perm[y]] - costs[y][perm[x]]
+
+                    if delta > max_delta:
+                        max_delta = delta
+                        max_delta_swap = (x, y)
+
+            if max_delta_swap is None:
+                return perm
+
+            (x, y) = max_delta_swap
+            (perm[x], perm[y]) = (perm[y], perm[x])
+
+    def test_matches_swap_passes(self):
+        seed = 99
+
+        for size in (0, 1, 2, 8, 12, 24):
+            for _ in range(20):
+                costs = []
+
+                for row in range(size):
+                    costs.append([])
+
+                    for col in range(size):
+                        seed = (seed * 1103515245 + 12345) % 2147483648
+                        costs[row].append(seed % 20)
+
+                self.assertEqual(best_swap_improvement(costs), self.swap_passes(costs))
+
+
+class TestResolveMany(unittest.TestCase):
+    filenames = (
+        "3x3x3-random-01.txt",
+        "2x2x2-random-01.txt",
+        "3x3x3-superflip.txt",
+        "4x4x4-random-01.txt",
+        "3x3x3-tetris.txt",
+        "4x4x4-random-03.txt",
+    )
+
+    def test_kociemba(self):
+        scans = [load_scan_data(filename) for filename in self.filenames]
+        expected = ["".join(resolve_scan_data(scan_data).cube_for_kociemba_strict()) for scan_data in scans]
+        self.assertEqual(resolve_many(scans), expected)
+
+    def test_json(self):
+        scans = [load_scan_data(filename) for filename in self.filenames]
+        expected = [resolve_scan_data(scan_data).cube_for_json() for scan_data in scans]
+        self.assertEqual(resolve_many(scans, use_json=True), expected)
+
+    def test_width(self):
+        scans = [load_scan_data("3x3x3-random-01.txt"), load_scan_data("3x3x3-random-02.txt")]
+        self.assertEqual(resolve_many(scans, width=3), resolve_many(scans))
+
+    def test_empty(self):
+        self.assertEqual(resolve_many([]), [])
+
+    def test_workers(self):
+        try:
+            # standard libraries
+            import concurrent.futures  # noqa: F401
+        except ImportError:
+            # micropython
+            return
+
+        scans = [load_scan_data(filename) for filename in self.filenames]
+        self.assertEqual(resolve_many(scans, workers=2, chunksize=2), resolve_many(scans))
+
+    def test_metric(self):
+        # 3x3x3-random-06 resolves differently with cie2000
+        scans = [load_scan_data(filename) for filename in self.filenames + ("3x3x3-random-06.txt",)]
+        expected = []
+
+        for scan_data in scans:
+            cube = RubiksColorSolverGeneric(get_cube_width(scan_data))
+            cube.metric = "cie2000"
+            cube.enter_scan_data(scan_data)
+            cube.crunch_colors()
+            expected.append(cube.cube_for_json())
+
+        self.assertEqual(resolve_many(scans, use_json=True, metric="cie2000"), expected)
+        self.assertNotEqual(resolve_many(scans, use_json=True), expected)
+
+        with self.assertRaises(ValueError):
+            resolve_many(scans, metric="cie3000")
+
+        try:
+            # standard libraries
+            import concurrent.futures  # noqa: F401
+        except ImportError:
+            # micropython
+            return
+
+        self.assertEqual(resolve_many(scans, use_json=True, workers=2, chunksize=2, metric="cie2000"), expected)
+
+
+class TestResolveBatch(unittest.TestCase):
+    filenames = TestResolveMany.filenames
+
+    def batch(self, lines, use_json=False):
+        output_fh = io.StringIO()
+        errors = resolve_batch(io.StringIO("\n".join(lines) + "\n"), output_fh, use_json)
+        return (errors, [json_loads(line) for line in output_fh.getvalue().splitlines()])
+
+    def test_kociemba(self):
+        scans = [load_scan_data(filename) for filename in self.filenames]
+        (errors, results) = self.batch([json_dumps(scan_data) for scan_data in scans])
+        self.assertEqual(errors, 0)
+        self.assertEqual([result["kociemba"] for result in results], resolve_many(scans))
+
+    def test_json(self):
+        scans = [load_scan_data(filename) for filename in self.filenames[:2]]
+        (errors, results) = self.batch([json_dumps(scan_data) for scan_data in scans], use_json=True)
+        self.assertEqual(errors, 0)
+        self.assertEqual(results, [json_loads(json_dumps(result)) for result in resolve_many(scans, use_json=True)])
+
+    def test_errors(self):
+        scan = json_dumps(load_scan_data("3x3x3-random-01.txt"))
+        (errors, results) = self.batch([scan, "", '{"1": [1, 2, 3]}', "not json", scan])
+        self.assertEqual(errors, 2)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0], results[3])
+        self.assertEqual([results[1]["line"], results[2]["line"]], [3, 4])
+        self.assertIn("error", results[1])
+        self.assertIn("error", results[2])
+
+
+class TestServer(unittest.TestCase):
+    socket_path = "/tmp/test-rubiks-color-resolver.sock"
+
+    def test_clients(self):
+        try:
+            # standard libraries
+            import asyncio
+
+            # rubiks cube libraries
+            from rubikscolorresolver.server import ResolverClient, ResolverServer
+        except ImportError:
+            # micropython
+            return
+
+        scans = [load_scan_data(filename) for filename in TestResolveMany.filenames]
+
+        def client():
+            with ResolverClient(self.socket_path) as resolver_client:
+                results = [resolver_client.resolve(scan_data)["kociemba"] for scan_data in scans]
+                error = resolver_client.resolve({"1": [1, 2, 3]})
+                metric_error = resolver_client.request({"scan": {}, "metric": []})
+                return (results, error, metric_error, resolver_client.stats())
+
+        async def serve_clients():
+            server = ResolverServer(workers=1)
+            server.start_executor()
+            await server.start_unix(self.socket_path)
+            loop = asyncio.get_running_loop()
+
+            try:
+                return await asyncio.gather(loop.run_in_executor(None, client), loop.run_in_executor(None, client))
+            finally:
+                await server.close()
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            responses = loop.run_until_complete(serve_clients())
+        finally:
+            loop.close()
+
+        for (results, error, metric_error, stats) in responses:
+            self.assertEqual(results, resolve_many(scans))
+            self.assertIn("error", error)
+            self.assertIn("latency_us", error)
+            self.assertIn("metric must be a string", metric_error["error"])
+            self.assertLessEqual(stats["requests"], 2 * (len(scans) + 2))
+
+        self.assertGreaterEqual(max([response[-1]["errors"] for response in responses]), 2)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_worker_killed(self):
+        try:
+            # standard libraries
+            import asyncio
+            import signal
+
+            # rubiks cube libraries
+            from rubikscolorresolver.server import ResolverClient, ResolverServer
+        except ImportError:
+            # micropython
+            return
+
+        scan_data = load_scan_data("3x3x3-random-01.txt")
+
+        def client():
+            with ResolverClient(self.socket_path) as resolver_client:
+                return resolver_client.resolve(scan_data)
+
+        async def kill_worker():
+            server = ResolverServer(workers=1)
+            server.start_executor()
+            await server.start_unix(self.socket_path)
+            loop = asyncio.get_running_loop()
+
+            try:
+                os.kill(await loop.run_in_executor(server.executor, os.getpid), signal.SIGKILL)
+
+                # the first request after the kill may fail, the pool is then restarted
+                responses = []
+
+                for _ in range(3):
+                    responses.append(await loop.run_in_executor(None, client))
+                    await asyncio.sleep(0.1)
+
+                return responses
+            finally:
+                await server.close()
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            responses = loop.run_until_complete(kill_worker())
+        finally:
+            loop.close()
+
+        self.assertEqual(responses[-1]["kociemba"], resolve_many([scan_data])[0])
+
+    def test_not_a_socket(self):
+        try:
+            # standard libraries
+            import asyncio
+
+            # rubiks cube libraries
+            from rubikscolorresolver.server import ResolverServer
+        except ImportError:
+            # micropython
+            return
+
+        with open(self.socket_path, "w") as fh:
+            fh.write("not a socket")
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            self.assertRaises(
+                ValueError, loop.run_until_complete, ResolverServer(workers=1).start_unix(self.socket_path)
+            )
+            self.assertTrue(os.path.exists(self.socket_path))
+        finally:
+            loop.close()
+            os.remove(self.socket_path)
+
+
+class TestAsyncResolver(unittest.TestCase):
+    def run_async(self, resolve):
+        try:
+            # standard libraries
+            import asyncio
+
+            # rubiks cube libraries
+            from rubikscolorresolver.aio import AsyncResolver
+        except ImportError:
+            # micropython
+            return None
+
+        async def run():
+            # more threads than max_in_flight so the bound comes from the semaphore
+            async with AsyncResolver(workers=4, max_in_flight=2) as resolver:
+                max_in_flight = 0
+                task = asyncio.ensure_future(resolve(resolver))
+
+                while not task.done():
+                    max_in_flight = max(max_in_flight, resolver.in_flight)
+                    await asyncio.sleep(0.001)
+
+                # every slot is released once the executor is done with the scans,
+                # this includes scans that were cancelled or failed while running
+                for _ in range(500):
+                    if resolver.in_flight == 0:
+                        break
+                    await asyncio.sleep(0.01)
+
+                self.assertEqual(resolver.in_flight, 0)
+                self.assertLessEqual(max_in_flight, 2)
+                self.max_in_flight = max_in_flight
+                return task.result()
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            return loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_resolve_many(self):
+        scans = [load_scan_data(filename) for filename in TestResolveMany.filenames]
+
+        async def resolve(resolver):
+            results = await resolver.resolve_many(scans)
+            results.append(await resolver.resolve(json_dumps(scans[0])))
+            return results
+
+        results = self.run_async(resolve)
+
+        if results is not None:
+            self.assertEqual(results, resolve_many(scans) + resolve_many(scans[:1]))
+            self.assertEqual(self.max_in_flight, 2)
+
+    def test_error(self):
+        async def resolve(resolver):
+            try:
+                await resolver.resolve_many([load_scan_data("3x3x3-random-01.txt"), {1: (1, 2, 3)}])
+            except ValueError as e:
+                return str(e)
+
+        error = self.run_async(resolve)
+
+        if error is not None:
+            self.assertIn("scan data has 1", error)
+
+    def test_cancel(self):
+        # standard libraries
+        import asyncio
+
+        scans = [load_scan_data(filename) for filename in TestResolveMany.filenames]
+
+        async def resolve(resolver):
+            tasks = [asyncio.ensure_future(resolver.resolve(scan_data)) for scan_data in scans]
+            await asyncio.sleep(0)
+
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return [task.cancelled() for task in tasks]
+
+        cancelled = self.run_async(resolve)
+
+        if cancelled is not None:
+            self.assertEqual(cancelled, [True] * len(scans))
+
+
+class TestStageTimings(unittest.TestCase):
+    stages = (
+        "resolve_color_box",
+        "resolve_corner_squares",
+        "resolve_center_squares",
+        "resolve_edge_squares",
+        "set_state",
+    )
+
+    def test_per_scan(self):
+        scan_data = load_scan_data("4x4x4-random-01.txt")
+        cube = RubiksColorSolverGeneric(4)
+        cube.stage_timings = StageTimings()
+        cube.enter_scan_data(scan_data)
+        cube.crunch_colors()
+
+        timings = cube.stage_timings.as_dict()
+        self.assertEqual(timings["scans"], 1)
+        self.assertEqual(sorted(timings["stages"].keys()), sorted(self.stages))
+
+        for stats in timings["stages"].values():
+            self.assertEqual(stats["calls"], 1)
+            self.assertGreaterEqual(stats["time_us"], 0)
+
+        self.assertEqual(cube.cube_for_kociemba_strict(), resolve_scan_data(scan_data).cube_for_kociemba_strict())
+        self.assertEqual(json_loads(cube.stage_timings.to_json()), timings)
+
+    def test_batch(self):
+        scans = [load_scan_data(filename) for filename in TestResolveMany.filenames]
+        timings = StageTimings()
+        self.assertEqual(resolve_many(scans, timings=timings), resolve_many(scans))
+        self.assertEqual(timings.scans, len(scans))
+
+        for stage in self.stages:
+            self.assertEqual(timings.calls[stage], len(scans))
+
+        merged = StageTimings()
+        merged.merge(timings)
+        merged.merge(timings.as_dict())
+        self.assertEqual(merged.scans, len(scans) * 2)
+        self.assertEqual(merged.time_us["set_state"], timings.time_us["set_state"] * 2)
+
+    def test_workers(self):
+        try:
+            # standard libraries
+            import concurrent.futures  # noqa: F401
+        except ImportError:
+            # micropython
+            return
+
+        scans = [load_scan_data(filename) for filename in TestResolveMany.filenames]
+        timings = StageTimings()
+        self.assertEqual(resolve_many(scans, workers=2, chunksize=2, timings=timings), resolve_many(scans))
+        self.assertEqual(timings.scans, len(scans))
+        self.assertEqual(timings.calls["resolve_edge_squares"], len(scans))
+
+
+class TestDebugHtml(unittest.TestCase):
+    filename = "test-debug-html.html"
+
+    def tearDown(self):
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+    def test_write_debug_file(self):
+        scan_data = load_scan_data("3x3x3-random-01.txt")
+        cube = RubiksColorSolverGeneric(3)
+        cube.write_debug_file = True
+        cube.debug_filename = self.filename
+        cube.enter_scan_data(scan_data)
+        cube.crunch_colors()
+
+        with open(self.filename, "r") as fh:
+            html = fh.read()
+
+        self.assertTrue(html.startswith("<!DOCTYPE html>"))
+        self.assertTrue(html.rstrip().endswith("</html>"))
+        self.assertEqual(html.count("<!DOCTYPE html>"), 1)
+        self.assertEqual(cube.html_buffer, [])
+
+    def test_off_by_default(self):
+        cube = resolve_scan_data(load_scan_data("3x3x3-random-01.txt"))
+        self.assertFalse(cube.write_debug_file)
+        self.assertEqual(cube.html_buffer, [])
+
+
+class TestValidateScanData(unittest.TestCase):
+    def setUp(self):
+        self.scan_data = load_scan_data("2x2x2-random-01.txt")
+
+    def assertInvalid(self, scan_data):
+        cube = RubiksColorSolverGeneric(2)
+
+        with self.assertRaises(ValueError):
+            cube.enter_scan_data(scan_data)
+
+    def test_valid(self):
+        RubiksColorSolverGeneric(2).enter_scan_data(self.scan_data)
+
+    def test_string_keys(self):
+        RubiksColorSolverGeneric(2).enter_scan_data({str(key): value for (key, value) in self.scan_data.items()})
+
+    def test_missing_square(self):
+        del self.scan_data[24]
+        self.assertInvalid(self.scan_data)
+
+    def test_bad_position(self):
+        self.scan_data[25] = self.scan_data.pop(24)
+        self.assertInvalid(self.scan_data)
+
+    def test_bad_rgb(self):
+        self.scan_data[1] = (256, 0, 0)
+        self.assertInvalid(self.scan_data)
+
+        self.scan_data[1] = (1.5, 0, 0)
+        self.assertInvalid(self.scan_data)
+
+        self.scan_data[1] = (1, 2)
+        self.assertInvalid(self.scan_data)
+
+        self.scan_data[1] = (True, 0, 0)
+        self.assertInvalid(self.scan_data)
+
+        for rgb in (7, None, "abc"):
+            self.scan_data[1] = rgb
+            self.assertInvalid(self.scan_data)
+
+    def test_validate_false(self):
+        # without validation the missing square is not caught
+        del self.scan_data[24]
+        cube = RubiksColorSolverGeneric(2, validate=False)
+        cube.enter_scan_data(self.scan_data)
+
+    def test_resolve_many(self):
+        del self.scan_data[24]
+
+        with self.assertRaises(ValueError):
+            resolve_many([self.scan_data], width=2)
+
+
+class TestPackedCube(unittest.TestCase):
+    def test_from_scan_data(self):
+        scan_data = load_scan_data("2x2x2-random-01.txt")
+        packed = PackedCube.from_scan_data(scan_data)
+        self.assertEqual(packed.width, 2)
+        self.assertEqual(packed.rgb_list(), [scan_data[position] for position in range(1, 25)])
+        self.assertIsNone(packed.get_color_name(1))
+
+    def test_string_keys(self):
+        scan_data = load_scan_data("2x2x2-random-01.txt")
+        packed = PackedCube.from_scan_data({str(position): rgb for (position, rgb) in scan_data.items()})
+        self.assertEqual(packed.rgb_list(), PackedCube.from_scan_data(scan_data).rgb_list())
+
+    def test_resolve_packed(self):
+        for filename in ("3x3x3-tetris.txt", "4x4x4-random-01.txt"):
+            scan_data = load_scan_data(filename)
+            cube = resolve_scan_data(scan_data)
+            packed = PackedCube.from_scan_data(scan_data)
+            self.assertEqual(resolve_many([packed]), ["".join(cube.cube_for_kociemba_strict())])
+            self.assertEqual(packed.cube_for_kociemba_strict(), cube.cube_for_kociemba_strict())
+
+            for position in range(1, packed.square_count + 1):
+                self.assertEqual(packed.get_color_name(position), cube.pos2square[position].color_name)
+                self.assertEqual(str(packed.square(position)), str(cube.pos2square[position]))
+
+            side = packed.side("F")
+            self.assertEqual(
+                [str(square) for square in sorted(side.center_squares)],
+                [str(square) for square in sorted(cube.sideF.center_squares)],
+            )
+
+    def test_wrong_width(self):
+        packed = PackedCube.from_scan_data(load_scan_data("3x3x3-tetris.txt"))
+
+        with self.assertRaises(ValueError):
+            RubiksColorSolverGeneric(4).resolve_packed(packed)
+
+
+class TestLoadScan(unittest.TestCase):
+    def test_json(self):
+        for filename in ("2x2x2-random-01.txt", "3x3x3-tetris.txt", "7x7x7-random-01.txt"):
+            with open("tests/test-data/" + filename, "r") as fh:
+                packed = load_scan(fh.read())
+
+            expected = PackedCube.from_scan_data(load_scan_data(filename))
+            self.assertEqual(packed.width, expected.width)
+            self.assertEqual(packed.rgb_list(), expected.rgb_list())
+
+    def test_keys(self):
+        scan_data = load_scan_data("2x2x2-random-01.txt")
+        expected = PackedCube.from_scan_data(scan_data).rgb_list()
+        self.assertEqual(load_scan(scan_data).rgb_list(), expected)
+        self.assertEqual(load_scan({str(key): list(value) for (key, value) in scan_data.items()}).rgb_list(), expected)
+
+    def test_invalid(self):
+        scan_data = load_scan_data("2x2x2-random-01.txt")
+        self.assertRaises(ValueError, load_scan, "{1: (1, 2, 3)}")
+        self.assertRaises(ValueError, load_scan, "[1, 2, 3]")
+        self.assertRaises(ValueError, load_scan, '{"1": [1, 2, 3]}')
+
+        for (position, rgb) in ((1, (1, 2)), (2, (1, 2, 256)), (3, (1, "2", 3)), (4, 7), (5, (True, 2, 3))):
+            bad_scan_data = dict(scan_data)
+            bad_scan_data[position] = rgb
+            self.assertRaises(ValueError, load_scan, bad_scan_data)
+
+        bad_scan_data = dict(scan_data)
+        del bad_scan_data[24]
+        bad_scan_data["01"] = (1, 2, 3)
+        self.assertRaises(ValueError, load_scan, bad_scan_data)
+
+        bad_scan_data[25] = bad_scan_data.pop("01")
+        self.assertRaises(ValueError, load_scan, bad_scan_data)
+
+        # 8x8x8 is a valid number of squares but it is not supported
+        self.assertRaises(ValueError, load_scan, {position: (1, 2, 3) for position in range(1, 385)})
+
+
+class TestTSPMatrix(unittest.TestCase):
+    """
+    The numpy and pure python distance matrices must be identical
+    """
+
+    def setUp(self):
+        self.cube = resolve_scan_data(load_scan_data("4x4x4-random-01.txt"))
+        self.numpy = solver.numpy
+
+    def tearDown(self):
+        solver.numpy = self.numpy
+
+    def assertMatrixSame(self, function, arg):
+        expected = function(arg)
+        solver.numpy = None
+        self.assertEqual([list(row) for row in function(arg)], [list(row) for row in expected])
+
+    def test_tsp_matrix(self):
+        self.assertMatrixSame(solver.tsp_matrix, self.cube.sideF.center_squares + self.cube.sideU.center_squares)
+
+    def test_tsp_matrix_corners(self):
+        (white, yellow, orange, red, green, blue) = self.cube.squares_from_color_box()
+        corners = [(white, green, orange), (yellow, blue, red)]
+        corners.append(tuple(self.cube.sideU.corner_squares[0:3]))
+        corners.append(tuple(self.cube.sideD.corner_squares[1:4]))
+        self.assertMatrixSame(solver.tsp_matrix_corners, corners)
+
+    def test_tsp_matrix_edge_pairs(self):
+        (white, yellow, orange, red, green, blue) = self.cube.squares_from_color_box()
+        edge_pairs = [(white, green), (yellow, blue), (red, orange)]
+        edge_pairs.extend(zip(self.cube.sideF.edge_squares, self.cube.sideB.edge_squares))
+        self.assertMatrixSame(solver.tsp_matrix_edge_pairs, edge_pairs)
+
+
+class TestDistanceCache(unittest.TestCase):
+    """
+    The cached distances must be identical to lab_distance(), with and without numpy
+    """
+
+    def setUp(self):
+        self.cube = resolve_scan_data(load_scan_data("4x4x4-random-01.txt"))
+        self.color_box_squares = list(self.cube.squares_from_color_box())
+        self.numpy = solver.numpy
+
+    def tearDown(self):
+        solver.numpy = self.numpy
+
+    def new_cache(self, use_numpy):
+        cache = DistanceCache(self.cube.squares_per_side * 6, use_numpy=use_numpy)
+        cache.set_squares(self.cube.pos2square.values())
+        cache.add_colors(self.cube.color_box, color_box=True)
+        return cache
+
+    def test_distance(self):
+        squares = self.cube.sideU.center_squares + self.cube.sideF.corner_squares + self.color_box_squares
+
+        for use_numpy in (True, False):
+            cache = self.new_cache(use_numpy)
+
+            for square1 in squares:
+                for square2 in squares:
+                    self.assertEqual(cache.distance(square1, square2), lab_distance(square1.lab, square2.lab))
+                    self.assertEqual(
+                        cache.color_distance(square1, self.cube.color_box, "Wh"),
+                        lab_distance(square1.lab, self.cube.color_box["Wh"]),
+                    )
+
+            self.assertEqual(
+                [list(row) for row in cache.matrix(squares, squares[:4])],
+                [[lab_distance(square1.lab, square2.lab) for square2 in squares[:4]] for square1 in squares],
+            )
+            self.assertTrue(cache.stats()["hits"] > 0)
+
+    def test_large_distances(self):
+        # these distances go past 16 bits, they must be stored as is
+        cubed = Metric(
+            "cubed",
+            lambda lab1, lab2: lab_distance(lab1, lab2) ** 3,
+            lambda lab_list1, lab_list2: lab_distance_matrix(lab_list1, lab_list2) ** 3,
+        )
+        squares = self.cube.sideU.corner_squares + self.color_box_squares
+
+        for use_numpy in (True, False):
+            cache = DistanceCache(self.cube.squares_per_side * 6, use_numpy=use_numpy, metric=cubed)
+            cache.set_squares(self.cube.pos2square.values())
+            cache.add_colors(self.cube.color_box, color_box=True)
+            distances = [cache.distance(square1, square2) for square1 in squares for square2 in squares]
+            self.assertTrue(max(distances) > 32767)
+
+            for (distance, (square1, square2)) in zip(distances, [(x, y) for x in squares for y in squares]):
+                # the numpy distances may be 1 off the scalar ones
+                expected = lab_distance(square1.lab, square2.lab)
+                self.assertIn(distance, [(expected - 1) ** 3, expected**3, (expected + 1) ** 3])
+
+    def test_tsp_matrix_corners(self):
+        (white, yellow, orange, red, green, blue) = self.color_box_squares
+        corners = [(white, green, orange), (yellow, blue, red)]
+        corners.append(tuple(self.cube.sideU.corner_squares[0:3]))
+        corners.append(tuple(self.cube.sideD.corner_squares[1:4]))
+        expected = [list(row) for row in solver.tsp_matrix_corners(corners)]
+
+        for use_numpy in (True, False):
+            if not use_numpy:
+                solver.numpy = None
+
+            cache = self.new_cache(use_numpy)
+            self.assertEqual([list(row) for row in solver.tsp_matrix_corners(corners, cache)], expected)
+
+    def test_crunch_colors(self):
+        cache = self.cube.distance_cache
+        self.assertTrue(cache.stats()["hits"] > 0)
+        self.assertTrue(cache.stats()["misses"] > 0)
+
+        # the distances are released once the cube is resolved
+        self.assertEqual(cache.table, None)
+
+
+class TestPairsByDist(unittest.TestCase):
+    def test_matches_stable_sort(self):
+        N = 24
+        seed = 7
+        distances = [[0] * N for _ in range(N)]
+
+        for i in range(N):
+            for j in range(i):
+                # small range so there are plenty of ties
+                seed = (seed * 1103515245 + 12345) % 2147483648
+                distances[i][j] = distances[j][i] = seed % 10
+
+        expected = [(i, j) for i in range(N) for j in range(i)]
+        expected.sort(key=lambda ij: distances[ij[0]][ij[1]])
+        self.assertEqual(list(pairs_by_dist(N, distances)), expected)
+
+    def test_left_triangular(self):
+        distances = [[], [3], [1, 2], [5, 4, 0]]
+        self.assertEqual(list(pairs_by_dist(4, distances)), [(3, 2), (2, 0), (2, 1), (1, 0), (3, 1), (3, 0)])
+
+
+class TestSolveTSP(unittest.TestCase):
+    def setUp(self):
+        # points on a line, the shortest path visits them in order
+        self.points = [0, 9, 2, 7, 4, 5, 6, 3, 8, 1]
+        self.distances = [[abs(x - y) for y in self.points] for x in self.points]
+
+    def test_line(self):
+        path = solve_tsp(self.distances)
+        self.assertEqual([self.points[x] for x in path], list(range(10)))
+
+    def test_endpoints(self):
+        # the path must run from the point at 4 to the point at 5
+        path = solve_tsp(self.distances, endpoints=(4, 5))
+        self.assertEqual((path[0], path[-1]), (4, 5))
+        self.assertEqual(sorted(path), list(range(10)))
+
+    def test_optim_steps(self):
+        # pseudo random points, the greedy path has plenty of room for improvement
+        seed = 3
+        points = []
+
+        for _ in range(40):
+            seed = (seed * 1103515245 + 12345) % 2147483648
+            points.append((seed % 1000, (seed >> 10) % 1000))
+
+        distances = [[((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5 for (x2, y2) in points] for (x1, y1) in points]
+
+        def path_cost(path):
+            return sum(distances[x][y] for (x, y) in zip(path, path[1:]))
+
+        greedy = solve_tsp(distances)
+        optimized = solve_tsp(distances, optim_steps=10)
+        self.assertEqual(sorted(optimized), list(range(40)))
+        self.assertEqual((optimized[0], optimized[-1]), (greedy[0], greedy[-1]))
+        self.assertLess(path_cost(optimized), path_cost(greedy))
+
+        # a budget of 0 seconds stops before the first pass completes
+        self.assertLessEqual(path_cost(solve_tsp(distances, optim_steps=10, time_budget=0)), path_cost(greedy))
+
+
 if __name__ == "__main__":
 
     # setup logging
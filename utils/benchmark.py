@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the resolver against the scans in tests/test-data
+
+usage: ./utils/benchmark.py [benchmark ...]
+
+Run from the root of the repo. If no benchmark is named they are all run.
+"""
+
+# standard libraries
+import ast
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# rubiks cube libraries
+from rubikscolorresolver import color, solver, tsp_solver_greedy
+from rubikscolorresolver.metric import METRICS
+from rubikscolorresolver.solver import (
+    RubiksColorSolverGeneric,
+    _resolve_many_worker,
+    _resolve_many_worker_init,
+    get_cube_width,
+    resolve_many,
+)
+from rubikscolorresolver.tsp_solver_greedy import solve_tsp
+
+TEST_DATA_DIR = "tests/test-data"
+
+
+def load_test_data():
+    """
+    Return a list of (filename, scan_data) tuples for every scan in TEST_DATA_DIR
+    """
+    scans = []
+
+    for filename in sorted(os.listdir(TEST_DATA_DIR)):
+        with open(os.path.join(TEST_DATA_DIR, filename), "r") as fh:
+            scan_data = {}
+
+            for (key, value) in json.load(fh).items():
+                scan_data[int(key)] = tuple(value)
+
+        scans.append((filename, scan_data))
+
+    return scans
+
+
+def load_test_cases():
+    """
+    Return the (desc, filename, expected) tuples from tests/test-cubes.py. The
+    expected results only live in that script, the test_cases literal is read out of
+    it without running the script.
+    """
+    with open("tests/test-cubes.py", "r") as fh:
+        tree = ast.parse(fh.read())
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and [target.id for target in node.targets] == ["test_cases"]:
+            return ast.literal_eval(node.value)
+
+    raise ValueError("tests/test-cubes.py does not have a test_cases tuple")
+
+
+def print_table(header, rows):
+    widths = [len(column) for column in header]
+
+    for row in rows:
+        for (index, column) in enumerate(row):
+            widths[index] = max(widths[index], len(column))
+
+    print("  ".join(column.rjust(widths[index]) for (index, column) in enumerate(header)))
+    print("  ".join("=" * width for width in widths))
+
+    for row in rows:
+        print("  ".join(column.rjust(widths[index]) for (index, column) in enumerate(row)))
+
+    print("")
+
+
+def benchmark_throughput(test_data, repetitions=20):
+    """
+    Compare building a new RubiksColorSolverGeneric per scan (what tests/test-cubes.py
+    does) against resolve_many()
+    """
+    scans = [scan_data for (_, scan_data) in test_data] * repetitions
+
+    def one_cube_per_scan():
+        results = []
+
+        for scan_data in scans:
+            cube = RubiksColorSolverGeneric(get_cube_width(scan_data))
+            cube.enter_scan_data(scan_data)
+            cube.crunch_colors()
+            results.append("".join(cube.cube_for_kociemba_strict()))
+
+        return results
+
+    def batch():
+        return resolve_many(scans)
+
+    rows = []
+    expected = None
+
+    for (desc, func) in (("one cube per scan", one_cube_per_scan), ("resolve_many", batch)):
+        start = time.perf_counter()
+        results = func()
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = results
+        elif results != expected:
+            raise Exception("{} results do not match".format(desc))
+
+        rows.append((desc, str(len(scans)), "{:.3f}".format(elapsed), "{:.1f}".format(len(scans) / elapsed)))
+
+    print("throughput (single core)")
+    print_table(("method", "scans", "seconds", "scans/sec"), rows)
+
+
+def benchmark_parallel(test_data, repetitions=100):
+    """
+    Measure the IPC overhead of the resolve_many() process pool for 3x3x3 scans by
+    comparing a single worker process against resolving the same scans in-process,
+    then show the speedup for os.cpu_count() workers.
+    """
+    scans = [scan_data for (filename, scan_data) in test_data if filename.startswith("3x3x3")] * repetitions
+
+    start = time.perf_counter()
+    expected = resolve_many(scans, width=3)
+    serial = time.perf_counter() - start
+
+    rows = [("in-process", "1", "-", "{:.3f}".format(serial), "{:.1f}".format(len(scans) / serial), "-")]
+
+    for chunksize in (1, 8, 32, 128):
+        with ProcessPoolExecutor(max_workers=1, initializer=_resolve_many_worker_init, initargs=((3,),)) as executor:
+            # wait for the worker to start so we only time the scans
+            executor.submit(len, ()).result()
+            start = time.perf_counter()
+            results = list(
+                executor.map(_resolve_many_worker, scans, repeat(3), repeat(False), repeat(True), chunksize=chunksize)
+            )
+            elapsed = time.perf_counter() - start
+
+        if results != expected:
+            raise Exception("chunksize {} results do not match".format(chunksize))
+
+        rows.append(
+            (
+                "process pool",
+                "1",
+                str(chunksize),
+                "{:.3f}".format(elapsed),
+                "{:.1f}".format(len(scans) / elapsed),
+                "{:.1f}%".format(((elapsed - serial) / serial) * 100),
+            )
+        )
+
+    workers = os.cpu_count()
+
+    if workers > 1:
+        start = time.perf_counter()
+        results = resolve_many(scans, width=3, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        if results != expected:
+            raise Exception("{} workers results do not match".format(workers))
+
+        rows.append(
+            (
+                "resolve_many",
+                str(workers),
+                "32",
+                "{:.3f}".format(elapsed),
+                "{:.1f}".format(len(scans) / elapsed),
+                "-",
+            )
+        )
+
+    print("3x3x3 process pool")
+    print_table(("method", "workers", "chunksize", "seconds", "scans/sec", "IPC overhead"), rows)
+
+
+def benchmark_distance_matrix(test_data, repetitions=20):
+    """
+    Time the tsp_matrix(), tsp_matrix_corners() and tsp_matrix_edge_pairs() calls made
+    while resolving each cube size, with and without numpy
+    """
+    if solver.numpy is None:
+        print("distance matrix: numpy is not installed, skipping")
+        return
+
+    # Record the arguments of every distance matrix built while resolving the scans
+    calls = {}
+    functions = ("tsp_matrix", "tsp_matrix_corners", "tsp_matrix_edge_pairs")
+    original = {}
+
+    def recorder(name, width):
+        def record(arg):
+            calls.setdefault(width, []).append((name, arg))
+            return original[name](arg)
+
+        return record
+
+    for (_, scan_data) in test_data:
+        width = get_cube_width(scan_data)
+
+        for name in functions:
+            original[name] = getattr(solver, name)
+            setattr(solver, name, recorder(name, width))
+
+        try:
+            resolve_many([scan_data])
+        finally:
+            for name in functions:
+                setattr(solver, name, original[name])
+
+    def run(width):
+        start = time.perf_counter()
+
+        for _ in range(repetitions):
+            for (name, arg) in calls[width]:
+                original[name](arg)
+
+        return (time.perf_counter() - start) / repetitions
+
+    rows = []
+
+    for width in sorted(calls.keys()):
+        vectorized = run(width)
+        numpy = solver.numpy
+        solver.numpy = None
+
+        try:
+            pure_python = run(width)
+        finally:
+            solver.numpy = numpy
+
+        rows.append(
+            (
+                "{}x{}x{}".format(width, width, width),
+                str(len(calls[width])),
+                "{:.2f}".format(pure_python * 1000),
+                "{:.2f}".format(vectorized * 1000),
+                "{:.1f}x".format(pure_python / vectorized),
+            )
+        )
+
+    print("distance matrices for all scans of each size")
+    print_table(("cube", "matrices", "python(ms)", "numpy(ms)", "speedup"), rows)
+
+
+def benchmark_memory(test_data):
+    """
+    Report the bytes allocated by resolving one cube of each size. "retained" is
+    what the RubiksColorSolverGeneric (and the rgb2lab cache) still holds once the
+    cube is resolved, "peak" is the high-water mark while resolving it.
+    """
+    scans = {}
+
+    for (_, scan_data) in test_data:
+        scans.setdefault(get_cube_width(scan_data), scan_data)
+
+    rows = []
+
+    for width in sorted(scans.keys()):
+        # warm up so the lazy imports of the cube_NNN modules are not counted
+        resolve_many([scans[width]])
+        color.rgb2lab_cache.clear()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+
+        cube = RubiksColorSolverGeneric(width)
+        cube.enter_scan_data(scans[width])
+        cube.crunch_colors()
+
+        (after, peak) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        cube = None
+
+        rows.append(
+            ("{}x{}x{}".format(width, width, width), "{:,}".format(after - before), "{:,}".format(peak - before))
+        )
+
+    print("memory per resolved cube")
+    print_table(("cube", "retained(bytes)", "peak(bytes)"), rows)
+
+
+def pairs_by_dist_full_sort(N, distances):
+    """
+    The original pairs_by_dist(), every pair is sorted with a lambda key
+    """
+    indices = []
+
+    for i in range(N):
+        for j in range(i):
+            indices.append(i * N + j)
+
+    indices.sort(key=lambda ij: distances[ij // N][ij % N])
+    return ((ij // N, ij % N) for ij in indices)
+
+
+def benchmark_tsp(test_data, repetitions=50):
+    """
+    Time solve_tsp() on random symmetric distance matrices, using the original
+    pairs_by_dist() and the current one
+    """
+    rng = random.Random(0)
+    rows = []
+
+    for N in (8, 24, 48, 96, 150):
+        distances = [[0] * N for _ in range(N)]
+
+        for i in range(N):
+            for j in range(i):
+                distances[i][j] = distances[j][i] = rng.randint(0, 200)
+
+        timings = []
+        paths = []
+        pairs_by_dist = tsp_solver_greedy.pairs_by_dist
+
+        for func in (pairs_by_dist_full_sort, pairs_by_dist):
+            tsp_solver_greedy.pairs_by_dist = func
+
+            try:
+                start = time.perf_counter()
+
+                for _ in range(repetitions):
+                    path = solve_tsp(distances)
+
+                timings.append((time.perf_counter() - start) / repetitions)
+                paths.append(path)
+            finally:
+                tsp_solver_greedy.pairs_by_dist = pairs_by_dist
+
+        if paths[0] != paths[1]:
+            raise Exception("N {} paths do not match".format(N))
+
+        rows.append(
+            (
+                str(N),
+                "{:.3f}".format(timings[0] * 1000),
+                "{:.3f}".format(timings[1] * 1000),
+                "{:.2f}x".format(timings[0] / timings[1]),
+            )
+        )
+
+    print("solve_tsp")
+    print_table(("N", "full sort(ms)", "current(ms)", "speedup"), rows)
+
+
+def benchmark_metric(test_data, repetitions=3):
+    """
+    For each distance metric show how many of the tests/test-cubes.py cases it
+    resolves correctly, the time per scan, and how many distances per second the
+    scalar and batch forms compute
+    """
+    test_cases = load_test_cases()
+    labs = []
+
+    for (_, scan_data) in test_data:
+        if len(scan_data) == 294:
+            labs = [color.rgb2lab(rgb) for rgb in scan_data.values()]
+            break
+
+    pairs = len(labs) * len(labs)
+    rows = []
+
+    def distances_per_second(func):
+        color.cie2000_cache.clear()
+        start = time.perf_counter()
+
+        for lab1 in labs:
+            for lab2 in labs:
+                func(lab1, lab2)
+
+        return pairs / (time.perf_counter() - start)
+
+    for name in METRICS.keys():
+        metric = METRICS[name]
+        passed = 0
+
+        for (_, filename, expected) in test_cases:
+            with open("tests/" + filename, "r") as fh:
+                scan_data = {}
+
+                for (key, value) in json.load(fh).items():
+                    scan_data[int(key)] = tuple(value)
+
+            cube = RubiksColorSolverGeneric(get_cube_width(scan_data))
+            cube.metric = name
+            cube.enter_scan_data(scan_data)
+            cube.crunch_colors()
+
+            if "".join(cube.cube_for_kociemba_strict()) == expected:
+                passed += 1
+
+        start = time.perf_counter()
+
+        for _ in range(repetitions):
+            for (_, scan_data) in test_data:
+                cube = RubiksColorSolverGeneric(get_cube_width(scan_data))
+                cube.metric = name
+                cube.enter_scan_data(scan_data)
+                cube.crunch_colors()
+
+        per_scan = (time.perf_counter() - start) / (repetitions * len(test_data))
+
+        if solver.numpy is None:
+            batch = "-"
+        else:
+            start = time.perf_counter()
+            metric.numpy_distance_matrix(labs, labs)
+            batch = "{:,.0f}".format(pairs / (time.perf_counter() - start))
+
+        rows.append(
+            (
+                name,
+                "{}/{}".format(passed, len(test_cases)),
+                "{:.2f}".format(per_scan * 1000),
+                "{:,.0f}".format(distances_per_second(metric.distance)),
+                batch,
+            )
+        )
+
+    print("distance metrics")
+    print_table(("metric", "test-cubes", "ms/scan", "scalar/sec", "batch/sec"), rows)
+
+
+BENCHMARKS = {
+    "throughput": benchmark_throughput,
+    "parallel": benchmark_parallel,
+    "distance_matrix": benchmark_distance_matrix,
+    "memory": benchmark_memory,
+    "tsp": benchmark_tsp,
+    "metric": benchmark_metric,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS.keys())
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print("ERROR: unknown benchmark {}, choose from {}".format(name, ", ".join(BENCHMARKS.keys())))
+            sys.exit(1)
+
+    test_data = load_test_data()
+
+    for name in names:
+        BENCHMARKS[name](test_data)